@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Order, MailingCampaign, MailingRecipient, MailingTemplate, MailingUsage
+from .models import Order, MailingCampaign, MailingRecipient, MailingTemplate, MailingUsage, MailingChunk, OrderImport
 
 # Register your models here.
 admin.site.register(Order)
@@ -26,6 +26,20 @@ class MailingRecipientAdmin(admin.ModelAdmin):
     search_fields = ['email', 'campaign__user__email']
     readonly_fields = ['review_token', 'sent_at', 'delivered_at', 'opened_at', 'clicked_at', 'reviewed_at']
 
+@admin.register(MailingChunk)
+class MailingChunkAdmin(admin.ModelAdmin):
+    list_display = ['campaign', 'number', 'status', 'recipient_count', 'sent_count', 'failed_count', 'attempts', 'completed_at']
+    list_filter = ['status']
+    search_fields = ['campaign__user__email']
+    readonly_fields = ['created_at', 'completed_at']
+
+@admin.register(OrderImport)
+class OrderImportAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'mode', 'status', 'processed_rows', 'created_count', 'updated_count', 'error_count', 'created_at', 'finished_at']
+    list_filter = ['status', 'mode']
+    search_fields = ['user__email']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
 @admin.register(MailingUsage)
 class MailingUsageAdmin(admin.ModelAdmin):
     list_display = ['user', 'year', 'month', 'mailings_sent', 'emails_sent']
@@ -0,0 +1,165 @@
+"""
+Background import of order CSV uploads.
+
+The upload is read as a stream and validated row by row. Valid rows are
+inserted in chunks with bulk_create, and progress is saved after each chunk.
+Rejected rows go to a CSV error report that the merchant can download.
+
+Orders are unique per (user, order_id). In 'create' mode rows for orders that
+already exist are rejected; in 'upsert' mode they update the existing order,
+so re-uploading an overlapping export neither duplicates orders nor resends
+review emails.
+"""
+import csv
+import datetime
+import tempfile
+from io import TextIOWrapper
+
+from django.conf import settings
+from django.core.files import File
+from django.utils import timezone
+
+from reviews.models import Review
+from reviews.search import refresh_search_vectors
+from .models import Order, OrderImport
+
+REQUIRED_FIELDS = ['Order ID', 'Customer Name', 'Email', 'Phone Number', 'Shipment Date']
+
+# Column -> model field whose max_length the value must fit
+FIELD_LENGTHS = {
+    'Order ID': 'order_id',
+    'Customer Name': 'customer_name',
+    'Phone Number': 'phone_number',
+    'Email': 'email',
+}
+
+# Columns an upsert overwrites on an existing order; review token and sent flag are kept
+UPSERT_FIELDS = ['customer_name', 'email', 'phone_number', 'shipment_date']
+
+
+def parse_order_row(row):
+    """Return (order fields, None) for a valid CSV row or (None, error message)"""
+    # Check for missing columns
+    if not all(field in row for field in REQUIRED_FIELDS):
+        return None, "Missing required columns."
+
+    # Handle null/empty values
+    values = {column: (row.get(column) or '').strip() for column in FIELD_LENGTHS}
+    if not all(values.values()):
+        return None, "One or more required fields are empty."
+
+    for column, field_name in FIELD_LENGTHS.items():
+        max_length = Order._meta.get_field(field_name).max_length
+        if len(values[column]) > max_length:
+            return None, f"{column} is longer than {max_length} characters."
+
+    shipment_date_str = (row.get('Shipment Date') or '').strip()
+    try:
+        shipment_date = datetime.datetime.strptime(shipment_date_str, '%Y-%m-%d').date() if shipment_date_str else None
+    except Exception:
+        return None, "Invalid shipment date format."
+
+    return {
+        'order_id': values['Order ID'],
+        'customer_name': values['Customer Name'],
+        'email': values['Email'],
+        'phone_number': values['Phone Number'],
+        'shipment_date': shipment_date,
+    }, None
+
+
+def _save_progress(order_import, **extra):
+    OrderImport.objects.filter(id=order_import.id).update(
+        processed_rows=order_import.processed_rows,
+        created_count=order_import.created_count,
+        updated_count=order_import.updated_count,
+        error_count=order_import.error_count,
+        **extra,
+    )
+
+
+def run_order_import(order_import):
+    """Parse, validate and insert (or upsert) the rows of an OrderImport, recording progress as it goes"""
+    chunk_size = getattr(settings, 'ORDER_IMPORT_CHUNK_SIZE', 2000)
+    upsert = order_import.mode == 'upsert'
+    order_import.started_at = timezone.now()
+    OrderImport.objects.filter(id=order_import.id).update(status='processing', started_at=order_import.started_at)
+
+    with tempfile.TemporaryFile(mode='w+', newline='', encoding='utf-8') as report:
+        report_writer = csv.writer(report)
+        report_writer.writerow(['row', 'error'])
+
+        def reject(row_number, message):
+            order_import.error_count += 1
+            report_writer.writerow([row_number, message])
+
+        def insert(chunk):
+            existing = set(
+                Order.objects.filter(user_id=order_import.user_id, order_id__in=chunk.keys())
+                .values_list('order_id', flat=True)
+            )
+            try:
+                if upsert:
+                    Order.objects.bulk_create(
+                        [order for _, order in chunk.values()],
+                        update_conflicts=True,
+                        unique_fields=['user', 'order_id'],
+                        update_fields=UPSERT_FIELDS,
+                    )
+                    order_import.updated_count += len(existing)
+                    order_import.created_count += len(chunk) - len(existing)
+                else:
+                    for order_id in existing:
+                        reject(chunk.pop(order_id)[0], "Order ID already exists.")
+                    Order.objects.bulk_create([order for _, order in chunk.values()])
+                    order_import.created_count += len(chunk)
+            except Exception as e:
+                for row_number, _ in chunk.values():
+                    reject(row_number, f"Failed to create order. Error: {e}")
+            else:
+                if upsert and existing:
+                    # bulk_create skips the Order post_save signal that keeps review search vectors current
+                    refresh_search_vectors(
+                        Review.objects.filter(order__user_id=order_import.user_id, order__order_id__in=existing)
+                        .values_list('id', flat=True)
+                    )
+
+        with order_import.file.open('rb') as upload:
+            reader = csv.DictReader(TextIOWrapper(upload, encoding='utf-8-sig'))
+            # Keyed by order id: one statement may not insert or update the same order twice
+            chunk = {}
+            for row_number, row in enumerate(reader, start=2):  # start=2 to account for header row
+                fields, error = parse_order_row(row)
+                order_import.processed_rows += 1
+                if error:
+                    reject(row_number, error)
+                elif fields['order_id'] in chunk:
+                    if upsert:
+                        # The later row wins, as if it had been imported after the earlier one
+                        chunk[fields['order_id']] = (row_number, Order(user_id=order_import.user_id, **fields))
+                        order_import.updated_count += 1
+                    else:
+                        reject(row_number, "Duplicate Order ID in file.")
+                else:
+                    chunk[fields['order_id']] = (row_number, Order(user_id=order_import.user_id, **fields))
+
+                if len(chunk) >= chunk_size:
+                    insert(chunk)
+                    chunk = {}
+                    _save_progress(order_import)
+            if chunk:
+                insert(chunk)
+
+        if order_import.error_count:
+            report.seek(0)
+            order_import.error_report.save(f"import-{order_import.id}-errors.csv", File(report), save=False)
+
+    order_import.status = 'done'
+    order_import.finished_at = timezone.now()
+    _save_progress(
+        order_import,
+        status=order_import.status,
+        finished_at=order_import.finished_at,
+        error_report=order_import.error_report.name or None,
+    )
+    return order_import
@@ -0,0 +1,185 @@
+"""
+Batched email delivery through SendGrid personalizations.
+
+Recipients that share the same message template are sent in a single API
+call: the subject and content carry substitution tags such as
+-customer_name-, and every recipient becomes one personalization holding
+their own values. SendGrid accepts up to 1000 personalizations per call.
+
+If SendGrid rejects a batched call as invalid (HTTP 400), typically
+because of a single bad address, every recipient of that batch is sent on
+its own so the valid ones still receive their email.
+
+The transport that performs the call is selected by the MAIL_TRANSPORT
+setting. LocalTransport keeps the rendered messages in memory so batching
+can be exercised offline and API calls can be counted.
+"""
+import re
+import threading
+
+import requests
+import sendgrid
+from django.conf import settings
+from django.utils.html import escape
+from django.utils.module_loading import import_string
+from sendgrid.helpers.mail import Content, Mail, Personalization, Substitution, To
+
+from utils import http_client
+
+MAX_PERSONALIZATIONS = 1000
+
+SUBSTITUTION_TAG_RE = re.compile(r'-[a-z_]+-')
+
+
+def substitution_tag(name, html=False):
+    """Tag replaced by SendGrid; the html variant receives the escaped value"""
+    return f"-{name}_html-" if html else f"-{name}-"
+
+
+def substitutions_for(values):
+    """Expand {name: value} into the plain and HTML-escaped substitution tags"""
+    substitutions = {}
+    for name, value in values.items():
+        value = '' if value is None else str(value)
+        substitutions[substitution_tag(name)] = value
+        substitutions[substitution_tag(name, html=True)] = str(escape(value))
+    return substitutions
+
+
+def render_substitutions(text, substitutions):
+    """Replace every known tag in one pass, the way SendGrid applies substitutions"""
+    return SUBSTITUTION_TAG_RE.sub(lambda match: substitutions.get(match.group(0), match.group(0)), text)
+
+
+def split_batches(recipients, email, batch_size=MAX_PERSONALIZATIONS):
+    """
+    Split recipients into batches of at most `batch_size`; `email(recipient)` returns the address.
+    An address appears at most once per batch, so repeated addresses move to a later batch.
+    """
+    batch_size = max(1, min(batch_size, MAX_PERSONALIZATIONS))
+    batches = []
+    for recipient in recipients:
+        address = email(recipient).lower()
+        for batch, seen in batches:
+            if len(batch) < batch_size and address not in seen:
+                break
+        else:
+            batch, seen = [], set()
+            batches.append((batch, seen))
+        batch.append(recipient)
+        seen.add(address)
+    return [batch for batch, _ in batches]
+
+
+def build_batch_mail(subject, html, text, recipients):
+    """Build one Mail with a personalization per (email, values) recipient"""
+    email_message = Mail(from_email=settings.DEFAULT_FROM_EMAIL, subject=subject)
+    for email, values in recipients:
+        personalization = Personalization()
+        personalization.add_to(To(email))
+        for tag, value in substitutions_for(values).items():
+            personalization.add_substitution(Substitution(tag, value))
+        email_message.add_personalization(personalization)
+    email_message.add_content(Content("text/html", html))
+    email_message.add_content(Content("text/plain", text))
+
+    # Disable link tracking for review URLs
+    email_message.tracking_settings = sendgrid.helpers.mail.TrackingSettings()
+    email_message.tracking_settings.click_tracking = sendgrid.helpers.mail.ClickTracking(False, False)
+    return email_message
+
+
+def is_rejected(error):
+    """True when SendGrid refused the request itself (HTTP 400), so resending it unchanged cannot succeed"""
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 400
+
+
+def send_batch(transport, subject, html, text, recipients, rate_limiter=None):
+    """
+    Send [(email, values)] as one batched message and return one error per recipient, None when sent.
+    A rejected batch falls back to one message per recipient; any other failure is raised.
+    """
+    try:
+        transport.send(build_batch_mail(subject, html, text, recipients))
+        return [None] * len(recipients)
+    except Exception as e:
+        if not is_rejected(e):
+            raise
+        if len(recipients) == 1:
+            return [e]
+
+    errors = []
+    for recipient in recipients:
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            transport.send(build_batch_mail(subject, html, text, [recipient]))
+            errors.append(None)
+        except Exception as e:
+            errors.append(e)
+    return errors
+
+
+class SendGridTransport:
+    """Send messages with the SendGrid API over the shared keep-alive HTTP session"""
+
+    endpoint = 'https://api.sendgrid.com/v3/mail/send'
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or settings.SENDGRID_API_KEY
+
+    def send(self, email_message):
+        response = http_client.post(
+            self.endpoint,
+            json=email_message.get(),
+            headers={'Authorization': f'Bearer {self.api_key}'},
+        )
+        response.raise_for_status()
+        return response
+
+
+class LocalTransport:
+    """Record messages in memory instead of sending them, one outbox entry per recipient"""
+
+    outbox = []
+    calls = 0
+    # Addresses answered like SendGrid answers an invalid one: the whole call fails with HTTP 400
+    rejected_addresses = set()
+    _lock = threading.Lock()
+
+    def send(self, email_message):
+        payload = email_message.get()
+        contents = {content['type']: content['value'] for content in payload.get('content', [])}
+        addresses = {to['email'] for personalization in payload.get('personalizations', []) for to in personalization.get('to', [])}
+        with self._lock:
+            LocalTransport.calls += 1
+        if addresses & LocalTransport.rejected_addresses:
+            response = requests.Response()
+            response.status_code = 400
+            raise requests.HTTPError("400 Client Error: Bad Request", response=response)
+
+        rendered = []
+        for personalization in payload.get('personalizations', []):
+            substitutions = personalization.get('substitutions', {})
+            rendered.append({
+                'to': [to['email'] for to in personalization.get('to', [])],
+                'subject': render_substitutions(payload.get('subject', ''), substitutions),
+                'html': render_substitutions(contents.get('text/html', ''), substitutions),
+                'text': render_substitutions(contents.get('text/plain', ''), substitutions),
+            })
+        with self._lock:
+            LocalTransport.outbox.extend(rendered)
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.outbox = []
+            cls.calls = 0
+            cls.rejected_addresses = set()
+
+
+def get_mail_transport():
+    """Instantiate the transport configured by MAIL_TRANSPORT"""
+    path = getattr(settings, 'MAIL_TRANSPORT', 'orders.mail_batch.SendGridTransport')
+    return import_string(path)()
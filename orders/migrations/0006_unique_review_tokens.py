@@ -0,0 +1,52 @@
+import uuid
+
+from django.db import migrations, models
+
+
+# Large tables: build the unique indexes without locking out writes
+INDEXES = [
+    ('orders_order_review_token_uniq', 'orders_order', 'review_token'),
+    ('orders_mailingrecipient_review_token_uniq', 'orders_mailingrecipient', 'review_token'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, table, column in INDEXES:
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX {concurrently}IF NOT EXISTS "{name}" ON "{table}" ("{column}")'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, table, column in INDEXES:
+        schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0005_add_country_to_mailing_recipient'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_indexes, drop_indexes),
+            ],
+            state_operations=[
+                migrations.AlterField(
+                    model_name='order',
+                    name='review_token',
+                    field=models.UUIDField(blank=True, default=uuid.uuid4, editable=False, null=True, unique=True),
+                ),
+                migrations.AlterField(
+                    model_name='mailingrecipient',
+                    name='review_token',
+                    field=models.UUIDField(default=uuid.uuid4, editable=False, unique=True),
+                ),
+            ],
+        ),
+    ]
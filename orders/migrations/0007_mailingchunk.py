@@ -0,0 +1,35 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0006_unique_review_tokens'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MailingChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('first_recipient_id', models.BigIntegerField()),
+                ('last_recipient_id', models.BigIntegerField()),
+                ('recipient_count', models.PositiveIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('done', 'Done')], default='pending', max_length=20)),
+                ('sent_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('campaign', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='orders.mailingcampaign')),
+            ],
+            options={
+                'ordering': ['campaign', 'number'],
+                'unique_together': {('campaign', 'number')},
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:57
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_mailingchunk'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # pg_trgm provides the gin_trgm_ops operator class
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='order',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('order_id'), name='gin_trgm_ops'), name='order_order_id_trgm_idx'),
+        ),
+    ]
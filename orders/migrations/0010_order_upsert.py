@@ -0,0 +1,108 @@
+import logging
+
+from django.conf import settings
+from django.db import migrations, models, transaction
+from django.db.models import Count
+
+
+CONSTRAINT_NAME = 'order_user_order_id_uniq'
+
+logger = logging.getLogger(__name__)
+
+
+def merge_duplicate_orders(apps, schema_editor):
+    """
+    Collapse orders re-imported under the same (user, order_id) into one row before the
+    unique constraint is built. The kept row is the first one whose review email went out
+    (its review link is the one the customer holds), otherwise the oldest; it takes the
+    newest row's customer data, and reviews of the dropped rows are moved onto it.
+    Review links of dropped rows stop working, so each dropped row and its token is logged.
+    """
+    Order = apps.get_model('orders', 'Order')
+    Review = apps.get_model('reviews', 'Review')
+    groups = (
+        Order.objects.filter(user__isnull=False)
+        .values('user_id', 'order_id')
+        .annotate(count=Count('id'))
+        .filter(count__gt=1)
+        .order_by()
+    )
+    for group in groups.iterator():
+        with transaction.atomic():
+            rows = list(Order.objects.filter(user_id=group['user_id'], order_id=group['order_id']).order_by('id'))
+            keep = next((row for row in rows if row.review_email_sent), rows[0])
+            newest = rows[-1]
+            drop_ids = [row.id for row in rows if row.id != keep.id]
+
+            keep.customer_name = newest.customer_name
+            keep.email = newest.email
+            keep.phone_number = newest.phone_number
+            keep.shipment_date = newest.shipment_date
+            keep.review_email_sent = any(row.review_email_sent for row in rows)
+            keep.save(update_fields=['customer_name', 'email', 'phone_number', 'shipment_date', 'review_email_sent'])
+
+            for row in rows:
+                if row.id != keep.id:
+                    logger.warning(
+                        "Merged duplicate order %s of user %s into %s; review token %s (email sent: %s) no longer resolves",
+                        row.id, group['user_id'], keep.id, row.review_token, row.review_email_sent,
+                    )
+            Review.objects.filter(order_id__in=drop_ids).update(order_id=keep.id)
+            Order.objects.filter(id__in=drop_ids).delete()
+
+
+def create_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        # Build the index without locking out writes, then promote it to the constraint
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS "{CONSTRAINT_NAME}" ON "orders_order" ("user_id", "order_id")'
+        )
+        schema_editor.execute(
+            f'ALTER TABLE "orders_order" ADD CONSTRAINT "{CONSTRAINT_NAME}" UNIQUE USING INDEX "{CONSTRAINT_NAME}"'
+        )
+    else:
+        schema_editor.execute(
+            f'CREATE UNIQUE INDEX IF NOT EXISTS "{CONSTRAINT_NAME}" ON "orders_order" ("user_id", "order_id")'
+        )
+
+
+def drop_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'ALTER TABLE "orders_order" DROP CONSTRAINT IF EXISTS "{CONSTRAINT_NAME}"')
+    else:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{CONSTRAINT_NAME}"')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0009_orderimport'),
+        ('reviews', '0011_review_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderimport',
+            name='mode',
+            field=models.CharField(choices=[('create', 'Create new orders only'), ('upsert', 'Create or update orders')], default='create', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='orderimport',
+            name='updated_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(merge_duplicate_orders, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_constraint, drop_constraint),
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='order',
+                    constraint=models.UniqueConstraint(fields=('user', 'order_id'), name=CONSTRAINT_NAME),
+                ),
+            ],
+        ),
+    ]
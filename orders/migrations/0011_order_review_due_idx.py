@@ -0,0 +1,39 @@
+from django.db import migrations, models
+
+
+# Large table: build the index without locking out writes
+INDEX_NAME = 'order_review_due_idx'
+
+
+def create_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        f'CREATE INDEX {concurrently}IF NOT EXISTS "{INDEX_NAME}" ON "orders_order" ("review_email_sent", "shipment_date")'
+    )
+
+
+def drop_index(apps, schema_editor):
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(f'DROP INDEX {concurrently}IF EXISTS "{INDEX_NAME}"')
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('orders', '0010_order_upsert'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(create_index, drop_index),
+            ],
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='order',
+                    index=models.Index(fields=['review_email_sent', 'shipment_date'], name=INDEX_NAME),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_order_review_due_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mailingchunk',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0012_mailingchunk_failed_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mailingchunk',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='mailingchunk',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20),
+        ),
+    ]
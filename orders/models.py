@@ -1,5 +1,9 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.files.storage import FileSystemStorage
+from django.db.models.functions import Upper
+from django.utils import timezone
 import uuid
 
 class Order(models.Model):
@@ -8,10 +12,22 @@ class Order(models.Model):
     customer_name = models.CharField(max_length=100)
     email = models.EmailField()
     phone_number = models.CharField(max_length=20)
-    review_token = models.UUIDField(default=uuid.uuid4, editable=False, null=True, blank=True)
+    review_token = models.UUIDField(default=uuid.uuid4, editable=False, null=True, blank=True, unique=True)
     shipment_date = models.DateField(null=True, blank=True)
     review_email_sent = models.BooleanField(default=False)
 
+    class Meta:
+        constraints = [
+            # CSV imports upsert on this key
+            models.UniqueConstraint(fields=['user', 'order_id'], name='order_user_order_id_uniq'),
+        ]
+        indexes = [
+            # Substring search on order ids; matches the UPPER(...) LIKE that icontains generates
+            GinIndex(OpClass(Upper('order_id'), name='gin_trgm_ops'), name='order_order_id_trgm_idx'),
+            # Daily review request dispatcher: unsent orders by shipment date
+            models.Index(fields=['review_email_sent', 'shipment_date'], name='order_review_due_idx'),
+        ]
+
     def __str__(self):
         return f"{self.order_id} - {self.customer_name}"
 
@@ -78,7 +94,7 @@ class MailingRecipient(models.Model):
     name = models.CharField(max_length=100, blank=True)
     order_number = models.CharField(max_length=50, blank=True)
     country = models.CharField(max_length=100, blank=True, help_text="Recipient's country for language localization (e.g., 'Czech', 'Slovak', 'en')")
-    review_token = models.UUIDField(default=uuid.uuid4, editable=False)
+    review_token = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     sent_at = models.DateTimeField(null=True, blank=True)
     delivered_at = models.DateTimeField(null=True, blank=True)
@@ -94,6 +110,83 @@ class MailingRecipient(models.Model):
         unique_together = ['campaign', 'email']
 
 
+class MailingChunk(models.Model):
+    """Slice of a campaign's recipients sent by one Celery subtask; doubles as a resume checkpoint"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    campaign = models.ForeignKey(MailingCampaign, on_delete=models.CASCADE, related_name='chunks')
+    number = models.PositiveIntegerField()
+    # Recipients are bulk-created, so a chunk is a contiguous id range within the campaign
+    first_recipient_id = models.BigIntegerField()
+    last_recipient_id = models.BigIntegerField()
+    recipient_count = models.PositiveIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    sent_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # When a worker moved it to 'sending'
+    created_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Chunk {self.number} of campaign {self.campaign_id} - {self.status}"
+
+    class Meta:
+        unique_together = ['campaign', 'number']
+        ordering = ['campaign', 'number']
+
+
+def order_import_storage():
+    """Uploaded order CSVs live on a volume shared by the web and Celery containers"""
+    return FileSystemStorage(location=settings.ORDER_IMPORT_ROOT)
+
+
+class OrderImport(models.Model):
+    """A CSV order upload processed in the background by orders.tasks.import_orders_csv"""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    MODE_CHOICES = [
+        ('create', 'Create new orders only'),
+        ('upsert', 'Create or update orders'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='order_imports')
+    file = models.FileField(upload_to='uploads/', storage=order_import_storage)
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default='create')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    processed_rows = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    error_report = models.FileField(upload_to='errors/', storage=order_import_storage, null=True, blank=True)
+    error_message = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Import {self.id} - {self.user.email} - {self.status}"
+
+    @property
+    def rows_per_second(self):
+        if not self.started_at:
+            return 0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return round(self.processed_rows / elapsed, 1) if elapsed > 0 else 0
+
+    class Meta:
+        ordering = ['-created_at']
+
+
 class MailingUsage(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='mailing_usage')
     year = models.IntegerField()
@@ -0,0 +1,34 @@
+from django.db.models import CharField, Value
+
+from .models import MailingRecipient, Order
+
+ORDER_TOKEN = 'order'
+MAILING_TOKEN = 'mailing'
+
+
+def resolve_review_token(token):
+    """
+    Find which table an emailed review token belongs to.
+
+    Both review_token columns are uniquely indexed; one UNION query over the two
+    index lookups tells whether the token is an Order or a MailingRecipient, and
+    the matching row is then loaded with its business.
+    Returns (order, recipient); both are None if the token is unknown.
+    """
+    source = CharField()
+    matches = (
+        Order.objects.filter(review_token=token)
+        .values_list(Value(ORDER_TOKEN, output_field=source), 'pk')
+        .union(
+            MailingRecipient.objects.filter(review_token=token)
+            .values_list(Value(MAILING_TOKEN, output_field=source), 'pk')
+        )
+    )
+    match = next(iter(matches), None)
+    if match is None:
+        return None, None
+
+    kind, pk = match
+    if kind == ORDER_TOKEN:
+        return Order.objects.select_related('user__business_category').get(pk=pk), None
+    return None, MailingRecipient.objects.select_related('campaign__user__business_category').get(pk=pk)
@@ -1,177 +1,359 @@
 from celery import shared_task
 from datetime import date, timedelta
 from django.conf import settings
+from django.core.cache import cache
 from django.urls import reverse
 from django.template.loader import render_to_string
-import sendgrid
-from sendgrid.helpers.mail import Mail, Content
 from django.utils import timezone
-from .models import Order, MailingCampaign, MailingRecipient
+from django.db import transaction
+from django.db.models import F, Q
+from .models import Order, MailingCampaign, MailingRecipient, MailingChunk, OrderImport
+from .csv_import import run_order_import
+from .dispatch import RateLimiter, dispatch_concurrently
+from .mail_batch import get_mail_transport, is_rejected, send_batch, split_batches, substitution_tag
 from utils.translation_service import (
     get_language_for_country,
+    track_fallbacks,
     translate_strings,
-    translate_sequence,
+    translate_template,
 )
 
+REVIEW_REQUEST_SUBJECT = 'We value your feedback! Please review your order'
+
+# Upper bound on how long a worker may hold a chunk before another copy can take it over
+MAILING_CHUNK_LOCK_TIMEOUT = 15 * 60
+
+
+def _review_link(review_token):
+    return f"https://api.level-4u.com/api/reviews/review/{review_token}/"
+
+
+def _review_request_window(today=None):
+    """
+    Shipment dates due for a review request: `REVIEW_EMAIL_DELAY_DAYS` ago, plus the
+    `REVIEW_EMAIL_CATCHUP_DAYS` before that so a missed run is made up the next day
+    """
+    today = today or date.today()
+    last_date = today - timedelta(days=getattr(settings, 'REVIEW_EMAIL_DELAY_DAYS', 5))
+    first_date = last_date - timedelta(days=getattr(settings, 'REVIEW_EMAIL_CATCHUP_DAYS', 7))
+    return first_date, last_date
+
+
+def _due_review_orders(first_date, last_date):
+    # Served by order_review_due_idx on (review_email_sent, shipment_date)
+    return Order.objects.filter(review_email_sent=False, shipment_date__range=(first_date, last_date))
+
+
+def _review_request_templates():
+    """Render the review request once; per-order values are filled in by SendGrid substitutions"""
+    html_message = render_to_string('orders/emails/review_request.html', {
+        'customer_name': substitution_tag('customer_name', html=True),
+        'order_id': substitution_tag('order_id', html=True),
+        'review_link': substitution_tag('review_link'),
+    })
+
+    # Plain text fallback
+    plain_message = (
+        f"Dear {substitution_tag('customer_name')},\n\n"
+        f"Thank you for your order (Order ID: {substitution_tag('order_id')}). Please take a moment to review your experience by clicking the link below:\n\n"
+        f"{substitution_tag('review_link')}\n\nThank you!"
+    )
+    return html_message, plain_message
+
+
 @shared_task
-def send_scheduled_review_emails():
-    target_date = date.today() - timedelta(days=5)
-    orders = Order.objects.filter(shipment_date=target_date, review_email_sent=False)
-    for order in orders:
-        review_link = f"https://api.level-4u.com/api/reviews/review/{order.review_token}/"
-        subject = 'We value your feedback! Please review your order'
-        
-        # Generate HTML email
-        html_message = render_to_string('orders/emails/review_request.html', {
-            'customer_name': order.customer_name,
-            'order_id': order.order_id,
-            'review_link': review_link
-        })
-        
-        # Plain text fallback
-        plain_message = (
-            f"Dear {order.customer_name},\n\n"
-            f"Thank you for your order (Order ID: {order.order_id}). Please take a moment to review your experience by clicking the link below:\n\n"
-            f"{review_link}\n\nThank you!"
+def send_scheduled_review_emails() -> str:
+    """Queue one review request subtask per merchant and contiguous range of due order ids."""
+    first_date, last_date = _review_request_window()
+    chunk_size = getattr(settings, 'REVIEW_EMAIL_CHUNK_SIZE', 1000)
+
+    # Streamed as (user_id, id) pairs so a million due orders never sit in memory as models
+    due = (
+        _due_review_orders(first_date, last_date)
+        .order_by('user_id', 'id')
+        .values_list('user_id', 'id')
+        .iterator(chunk_size=10000)
+    )
+    queued = 0
+    current_user, first_id, last_id, count = None, None, None, 0
+    for user_id, order_id in due:
+        if count and (user_id != current_user or count >= chunk_size):
+            send_review_email_chunk.delay(current_user, first_id, last_id, first_date.isoformat(), last_date.isoformat())
+            queued += 1
+            count = 0
+        if not count:
+            current_user, first_id = user_id, order_id
+        last_id = order_id
+        count += 1
+    if count:
+        send_review_email_chunk.delay(current_user, first_id, last_id, first_date.isoformat(), last_date.isoformat())
+        queued += 1
+
+    return f"Queued {queued} review request chunks for shipments {first_date} to {last_date}"
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_review_email_chunk(self, user_id, first_id: int, last_id: int, first_date: str, last_date: str) -> str:
+    """Send review requests for one merchant's due orders in an id range and mark them sent."""
+    # Keeps a retried or duplicated chunk from sending while another copy is still running
+    lock_key = f"review-emails:chunk:{user_id}:{first_id}:{last_id}"
+    locked = cache.add(lock_key, 1, timeout=MAILING_CHUNK_LOCK_TIMEOUT)
+    if locked is None:
+        # The cache swallows connection errors and returns None; try again once it is reachable
+        raise self.retry(exc=Exception(f"Could not lock review request chunk {first_id}-{last_id}"))
+    if not locked:
+        return f"Review request chunk {first_id}-{last_id} is already being sent"
+
+    error = None
+    sent_count = 0
+    try:
+        # Only orders still unsent are picked up, so a retry resumes where the last attempt stopped
+        orders = list(
+            _due_review_orders(date.fromisoformat(first_date), date.fromisoformat(last_date))
+            .filter(user_id=user_id, id__gte=first_id, id__lte=last_id)
+            .only('id', 'order_id', 'customer_name', 'email', 'review_token')
+        )
+        if not orders:
+            return f"Nothing left to send for chunk {first_id}-{last_id}"
+
+        html_message, plain_message = _review_request_templates()
+        messages = [
+            (batch, [
+                (order.email, {
+                    'customer_name': order.customer_name,
+                    'order_id': order.order_id,
+                    'review_link': _review_link(order.review_token),
+                })
+                for order in batch
+            ])
+            for batch in split_batches(orders, email=lambda order: order.email)
+        ]
+
+        transport = get_mail_transport()
+        rate_limiter = RateLimiter(getattr(settings, 'MAILING_RATE_LIMIT_PER_SECOND', 50))
+        for (batch, _), outcomes, send_error in dispatch_concurrently(
+            messages,
+            lambda item: send_batch(transport, REVIEW_REQUEST_SUBJECT, html_message, plain_message, item[1], rate_limiter),
+            max_workers=getattr(settings, 'MAILING_SEND_CONCURRENCY', 8),
+            rate_limiter=rate_limiter,
+        ):
+            if send_error is not None:
+                # Left unsent; the next daily run picks them up again
+                print(f"Failed to send batch of {len(batch)} review requests: {send_error}")
+                continue
+            done = []
+            for order, outcome in zip(batch, outcomes):
+                if outcome is None:
+                    done.append(order)
+                elif is_rejected(outcome):
+                    # The address will never be accepted; flag it so catch-up runs do not retry its batch
+                    print(f"Review request for order {order.order_id} was rejected: {outcome}")
+                    done.append(order)
+            try:
+                # Flagged as soon as the batch is sent, so a later failure never resends it
+                Order.objects.filter(id__in=[order.id for order in done]).update(review_email_sent=True)
+                sent_count += len(done)
+            except Exception as e:
+                # Keep flagging the batches still completing; the chunk is retried afterwards
+                error = error or e
+    except Exception as e:
+        error = e
+    finally:
+        cache.delete(lock_key)
+
+    if error is not None:
+        # Released first: the retry only sends orders that are still unflagged
+        raise self.retry(exc=error)
+    return f"Sent {sent_count} of {len(orders)} review requests for chunk {first_id}-{last_id}"
+
+
+MANUAL_STRINGS = {
+    'cs': {
+        'button_text': 'Klikněte zde pro recenzi',
+        'closing_text': 'Děkujeme za vaši cennou zpětnou vazbu. Vážíme si vašeho času a důvěry v naše služby.',
+        'footer_text': '© 2025 Level 4 You. Všechna práva vyhrazena.',
+    },
+    'sk': {
+        'button_text': 'Kliknite tu pre hodnotenie',
+        'closing_text': 'Ďakujeme za vašu cennú spätnú väzbu. Vážime si váš čas a dôveru v naše služby.',
+        'footer_text': '© 2025 Level 4 You. Všetky práva vyhradené.',
+    },
+}
+
+DEFAULT_MAILING_STRINGS = {
+    'button_text': 'Click Here to Review',
+    'closing_text': 'Thank you for your valuable feedback. We appreciate your time and trust in our service.',
+    'footer_text': '© 2025 Level 4 You. All rights reserved.',
+}
+
+
+# Campaign placeholders filled per recipient through substitution tags
+MAILING_PLACEHOLDERS = {
+    '[Customer Name]': 'customer_name',
+    '[Order Number]': 'order_number',
+    '[Review Link]': 'review_link',
+}
+
+
+def _mailing_language(campaign, recipient):
+    """Language of the template a recipient gets; None for the untranslated default"""
+    # Use recipient's country for language, fallback to campaign user's country
+    recipient_country = getattr(recipient, "country", "") or ""
+    if recipient_country:
+        language_code = get_language_for_country(recipient_country)
+    else:
+        language_code = get_language_for_country(getattr(campaign.user, "country", None))
+
+    # Only translate for Czech (cs) and Slovak (sk)
+    return language_code if language_code in MANUAL_STRINGS else None
+
+
+def _mailing_values(recipient):
+    return {
+        'customer_name': recipient.name or 'Valued Customer',
+        'order_number': recipient.order_number or '',
+        'review_link': _review_link(recipient.review_token),
+    }
+
+
+# Compiled templates are shared by all chunks of a campaign while it is being sent
+COMPILED_TEMPLATE_TIMEOUT = 60 * 60
+
+
+def _compile_mailing_template(campaign, language_code):
+    """
+    Compile the campaign into (subject, html, text) for one language.
+    Recipient values stay as substitution tags, so this runs once per campaign and language.
+    """
+    cache_key = f"mailing:compiled:{campaign.id}:{language_code or 'default'}"
+    compiled = cache.get(cache_key)
+    if compiled is not None:
+        return compiled
+
+    # Template strings: use hardcoded Czech/Slovak so they always show correctly even without API
+    template_strings = MANUAL_STRINGS.get(language_code, DEFAULT_MAILING_STRINGS)
+
+    company_name = campaign.user.business_name or campaign.user.email
+    subject = campaign.subject.replace('[Company Name]', company_name)
+    body = campaign.body.replace('[Company Name]', company_name)
+    tags = [substitution_tag(name) for name in MAILING_PLACEHOLDERS.values()]
+    for placeholder, name in MAILING_PLACEHOLDERS.items():
+        subject = subject.replace(placeholder, substitution_tag(name))
+        body = body.replace(placeholder, substitution_tag(name))
+
+    # Translate email content only for Czech and Slovak, keeping the tags untouched
+    fallbacks = []
+    if language_code:
+        with track_fallbacks() as fallbacks:
+            subject, body = translate_template([subject, body], language_code, tags)
+
+    # Remove the review link from body since we'll add it as a button
+    body_without_link = body.replace(substitution_tag('review_link'), '').strip()
+
+    # The HTML part receives escaped recipient values
+    html_subject = subject
+    for name in MAILING_PLACEHOLDERS.values():
+        html_subject = html_subject.replace(substitution_tag(name), substitution_tag(name, html=True))
+        body_without_link = body_without_link.replace(substitution_tag(name), substitution_tag(name, html=True))
+
+    # Generate HTML email with template
+    html_message = render_to_string('orders/emails/manual_mailing.html', {
+        'subject': html_subject,
+        'body_without_link': body_without_link,
+        'review_link': substitution_tag('review_link'),
+        'strings': template_strings,
+    })
+    compiled = (subject, html_message, body)
+    # An untranslated fallback is only used for this chunk; the next one tries the translation again
+    if not fallbacks:
+        cache.set(cache_key, compiled, COMPILED_TEMPLATE_TIMEOUT)
+    return compiled
+
+
+def _create_mailing_chunks(campaign):
+    """Split the campaign's pending recipients into contiguous id-range chunks"""
+    chunk_size = getattr(settings, 'MAILING_CHUNK_SIZE', 100)
+    recipient_ids = list(
+        campaign.recipients.filter(status='pending').order_by('id').values_list('id', flat=True)
+    )
+    chunks = []
+    for number, start in enumerate(range(0, len(recipient_ids), chunk_size)):
+        chunk_ids = recipient_ids[start:start + chunk_size]
+        chunks.append(MailingChunk(
+            campaign=campaign,
+            number=number,
+            first_recipient_id=chunk_ids[0],
+            last_recipient_id=chunk_ids[-1],
+            recipient_count=len(chunk_ids),
+        ))
+    return MailingChunk.objects.bulk_create(chunks)
+
+
+def _finalize_campaign_if_complete(campaign_id):
+    """Close the campaign once every chunk has finished; it is failed if any chunk gave up"""
+    chunks = MailingChunk.objects.filter(campaign_id=campaign_id)
+    if chunks.filter(status__in=['pending', 'sending']).exists():
+        return False
+    # Counters were already accumulated batch by batch
+    MailingCampaign.objects.filter(id=campaign_id).exclude(status__in=['sent', 'failed']).update(
+        status='failed' if chunks.filter(status='failed').exists() else 'sent',
+        sent_at=timezone.now(),
+    )
+    return True
+
+
+def _record_batch(chunk_id, campaign_id, recipients):
+    """
+    Persist the outcome of one sent batch and add it to the chunk and campaign progress.
+    Written as soon as the batch is sent, so a later failure never resends it.
+    """
+    sent_count = sum(1 for recipient in recipients if recipient.status == 'sent')
+    failed_count = sum(1 for recipient in recipients if recipient.status == 'failed')
+    with transaction.atomic():
+        MailingRecipient.objects.bulk_update(recipients, fields=['status', 'sent_at', 'error_message'])
+        MailingChunk.objects.filter(id=chunk_id).update(
+            sent_count=F('sent_count') + sent_count,
+            failed_count=F('failed_count') + failed_count,
         )
-        
-        sg = sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
-        email_message = Mail(
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to_emails=order.email,
-            subject=subject
+        MailingCampaign.objects.filter(id=campaign_id).update(
+            sent_count=F('sent_count') + sent_count,
+            delivered_count=F('delivered_count') + sent_count,  # Assuming sent = delivered (no bounce tracking)
         )
-        email_message.add_content(Content("text/html", html_message))
-        email_message.add_content(Content("text/plain", plain_message))
-        
-        # Disable link tracking for review URLs
-        email_message.tracking_settings = sendgrid.helpers.mail.TrackingSettings()
-        email_message.tracking_settings.click_tracking = sendgrid.helpers.mail.ClickTracking(False, False)
-        try:
-            sg.send(email_message)
-            order.review_email_sent = True
-            order.save()
-        except Exception as e:  
-            print(e)
+    return sent_count
+
+
+def _mark_recipients(recipients, status, error_message=''):
+    """Set the dispatch outcome on recipients in memory; persisted by bulk_update"""
+    now = timezone.now()
+    for recipient in recipients:
+        recipient.status = status
+        if status == 'sent':
+            recipient.sent_at = now
+        else:
+            recipient.error_message = error_message
 
 
 @shared_task
 def send_mailing_emails(campaign_id: int) -> str:
-    """Send emails for a manual mailing campaign (triggered asynchronously)."""
+    """Split a manual mailing campaign into chunks and queue one subtask per chunk."""
     try:
         campaign = MailingCampaign.objects.get(id=campaign_id)
-        recipients = campaign.recipients.all()
-
-        sg = sendgrid.SendGridAPIClient(api_key=settings.SENDGRID_API_KEY)
-        sent_count = 0
 
-        for recipient in recipients:
-            try:
-                # Use recipient's country for language, fallback to campaign user's country
-                recipient_country = getattr(recipient, "country", "") or ""
-                if recipient_country:
-                    language_code = get_language_for_country(recipient_country)
-                else:
-                    language_code = get_language_for_country(getattr(campaign.user, "country", None))
-                
-                # Only translate for Czech (cs) and Slovak (sk)
-                should_translate = language_code in ['cs', 'sk']
-                
-                # Template strings: use hardcoded Czech/Slovak so they always show correctly even without API
-                MANUAL_STRINGS = {
-                    'cs': {
-                        'button_text': 'Klikněte zde pro recenzi',
-                        'closing_text': 'Děkujeme za vaši cennou zpětnou vazbu. Vážíme si vašeho času a důvěry v naše služby.',
-                        'footer_text': '© 2025 Level 4 You. Všechna práva vyhrazena.',
-                    },
-                    'sk': {
-                        'button_text': 'Kliknite tu pre hodnotenie',
-                        'closing_text': 'Ďakujeme za vašu cennú spätnú väzbu. Vážime si váš čas a dôveru v naše služby.',
-                        'footer_text': '© 2025 Level 4 You. Všetky práva vyhradené.',
-                    },
-                }
-                if should_translate and language_code in MANUAL_STRINGS:
-                    template_strings = MANUAL_STRINGS[language_code]
-                else:
-                    template_strings = {
-                        'button_text': 'Click Here to Review',
-                        'closing_text': 'Thank you for your valuable feedback. We appreciate your time and trust in our service.',
-                        'footer_text': '© 2025 Level 4 You. All rights reserved.',
-                    }
-
-                # Replace variables in email content
-                subject = campaign.subject
-                body = campaign.body
-
-                replacements = {
-                    '[Customer Name]': recipient.name or 'Valued Customer',
-                    '[Order Number]': recipient.order_number or '',
-                    '[Company Name]': campaign.user.business_name or campaign.user.email,
-                    '[Review Link]': f"https://api.level-4u.com/api/reviews/review/{recipient.review_token}/",
-                }
-
-                for placeholder, value in replacements.items():
-                    subject = subject.replace(placeholder, value)
-                    body = body.replace(placeholder, value)
-
-                # Remove the review link from body since we'll add it as a button
-                review_link = replacements['[Review Link]']
-                body_without_link = body.replace(review_link, '').strip()
-
-                # Translate email content only for Czech and Slovak
-                if should_translate and language_code:
-                    translated_values = translate_sequence(
-                        [subject, body, body_without_link],
-                        language_code,
-                    )
-                    subject, body, body_without_link = translated_values
-
-                html_strings = template_strings
-
-                # Generate HTML email with template
-                html_message = render_to_string('orders/emails/manual_mailing.html', {
-                    'subject': subject,
-                    'body_without_link': body_without_link,
-                    'review_link': review_link,
-                    'strings': html_strings,
-                })
-                
-                # Create and send email
-                email_message = Mail(
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    to_emails=recipient.email,
-                    subject=subject
-                )
-                email_message.add_content(Content("text/html", html_message))
-                email_message.add_content(Content("text/plain", body))
-                
-                # Disable link tracking for review URLs
-                email_message.tracking_settings = sendgrid.helpers.mail.TrackingSettings()
-                email_message.tracking_settings.click_tracking = sendgrid.helpers.mail.ClickTracking(False, False)
-
-                sg.send(email_message)
-
-                # Update recipient status
-                recipient.status = 'sent'
-                recipient.sent_at = timezone.now()
-                recipient.save()
-
-                sent_count += 1
+        # Re-running the campaign resumes the unfinished chunks instead of starting over
+        if campaign.chunks.exists():
+            # A chunk left 'sending' by a crashed worker is taken over once its claim expires
+            chunks = list(campaign.chunks.filter(status__in=['pending', 'sending']))
+        else:
+            chunks = _create_mailing_chunks(campaign)
 
-            except Exception as e:
-                recipient.status = 'failed'
-                recipient.error_message = str(e)
-                recipient.save()
-                print(f"Failed to send email to {recipient.email}: {e}")
+        if not chunks:
+            _finalize_campaign_if_complete(campaign_id)
+            return f"Nothing left to send for campaign {campaign_id}"
 
-        # Update campaign stats
-        campaign.status = 'sent'
-        campaign.sent_count = sent_count
-        campaign.delivered_count = sent_count  # Assuming sent = delivered (no bounce tracking)
-        campaign.sent_at = timezone.now()
-        campaign.save()
+        for chunk in chunks:
+            send_mailing_chunk.delay(chunk.id)
 
-        return f"Sent {sent_count} emails for campaign {campaign_id}"
+        return f"Queued {len(chunks)} chunks for campaign {campaign_id}"
 
     except Exception as e:
         try:
@@ -181,4 +363,159 @@ def send_mailing_emails(campaign_id: int) -> str:
         except Exception:
             pass
         print(f"Failed to send mailing campaign {campaign_id}: {e}")
-        return f"Failed to send campaign {campaign_id}: {e}"
\ No newline at end of file
+        return f"Failed to send campaign {campaign_id}: {e}"
+
+
+def _send_chunk_recipients(campaign, chunk):
+    """
+    Send the chunk's pending recipients and persist each batch as it completes.
+    Batches that fail to send or to be recorded stay pending, and the error is raised once
+    the other batches are done.
+    """
+    # Only recipients still pending are sent, so a retried chunk resumes where it stopped
+    recipients = campaign.recipients.filter(
+        id__gte=chunk.first_recipient_id,
+        id__lte=chunk.last_recipient_id,
+        status='pending',
+    )
+
+    # Group recipients by template language; each group goes out in personalization batches
+    groups = {}
+    for recipient in recipients:
+        groups.setdefault(_mailing_language(campaign, recipient), []).append(recipient)
+
+    sent_count = 0
+    messages = []
+    for language_code, group in groups.items():
+        try:
+            subject, html_message, text_message = _compile_mailing_template(campaign, language_code)
+        except Exception as e:
+            _mark_recipients(group, 'failed', str(e))
+            _record_batch(chunk.id, campaign.id, group)
+            print(f"Failed to build {language_code or 'default'} email for campaign {campaign.id}: {e}")
+            continue
+        for batch in split_batches(group, email=lambda recipient: recipient.email):
+            messages.append((batch, (subject, html_message, text_message), [
+                (recipient.email, _mailing_values(recipient)) for recipient in batch
+            ]))
+
+    transport = get_mail_transport()
+    rate_limiter = RateLimiter(getattr(settings, 'MAILING_RATE_LIMIT_PER_SECOND', 50))
+    results = dispatch_concurrently(
+        messages,
+        lambda item: send_batch(transport, *item[1], item[2], rate_limiter),
+        max_workers=getattr(settings, 'MAILING_SEND_CONCURRENCY', 8),
+        rate_limiter=rate_limiter,
+    )
+    errors = []
+    for (batch, _, _), outcomes, error in results:
+        if error is not None:
+            # Left pending for the next attempt
+            errors.append(error)
+            print(f"Failed to send batch of {len(batch)} emails for campaign {campaign.id}: {error}")
+            continue
+        done = []
+        for recipient, outcome in zip(batch, outcomes):
+            if outcome is None:
+                _mark_recipients([recipient], 'sent')
+            elif is_rejected(outcome):
+                _mark_recipients([recipient], 'failed', str(outcome))
+            else:
+                # Left pending for the next attempt
+                errors.append(outcome)
+                continue
+            done.append(recipient)
+        try:
+            sent_count += _record_batch(chunk.id, campaign.id, done)
+        except Exception as e:
+            # Keep recording the batches still completing; only this one is sent again
+            errors.append(e)
+
+    if errors:
+        raise Exception(f"{len(errors)} sends of {len(messages)} batches did not go through: {errors[0]}")
+    return sent_count
+
+
+def _fail_chunk(campaign, chunk, error_message):
+    """Give up on a chunk: its still pending recipients are marked failed and the chunk is closed"""
+    pending = list(campaign.recipients.filter(
+        id__gte=chunk.first_recipient_id,
+        id__lte=chunk.last_recipient_id,
+        status='pending',
+    ))
+    _mark_recipients(pending, 'failed', error_message)
+    _record_batch(chunk.id, campaign.id, pending)
+    MailingChunk.objects.filter(id=chunk.id, status='sending').update(
+        status='failed',
+        completed_at=timezone.now(),
+    )
+
+
+def _claim_chunk(chunk_id):
+    """
+    Move a chunk to 'sending' with one conditional UPDATE; False when another worker holds it.
+    A claim older than MAILING_CHUNK_LOCK_TIMEOUT belongs to a worker that died and is taken over.
+    """
+    now = timezone.now()
+    return bool(MailingChunk.objects.filter(
+        Q(status='pending') | Q(status='sending', claimed_at__lt=now - timedelta(seconds=MAILING_CHUNK_LOCK_TIMEOUT)),
+        id=chunk_id,
+    ).update(status='sending', claimed_at=now, attempts=F('attempts') + 1))
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def send_mailing_chunk(self, chunk_id: int) -> str:
+    """Send one chunk of a campaign concurrently under the global rate limit."""
+    chunk = MailingChunk.objects.select_related('campaign__user').get(id=chunk_id)
+    if chunk.status in ('done', 'failed'):
+        return f"Chunk {chunk_id} already {chunk.status}"
+
+    # Claimed in the database, so a re-queued copy never sends while another is still in flight
+    if not _claim_chunk(chunk_id):
+        return f"Chunk {chunk_id} is already being sent"
+
+    campaign = chunk.campaign
+    error = None
+    try:
+        sent_count = _send_chunk_recipients(campaign, chunk)
+        # Progress was recorded batch by batch; this only closes the chunk
+        MailingChunk.objects.filter(id=chunk_id, status='sending').update(
+            status='done',
+            completed_at=timezone.now(),
+        )
+    except Exception as e:
+        error = e
+        if self.request.retries >= self.max_retries:
+            _fail_chunk(campaign, chunk, str(e))
+        else:
+            # Released before the retry is queued, so the retry can claim it again
+            MailingChunk.objects.filter(id=chunk_id, status='sending').update(status='pending', claimed_at=None)
+
+    if error is not None:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=error)
+        print(f"Giving up on chunk {chunk.number} of campaign {campaign.id}: {error}")
+
+    _finalize_campaign_if_complete(campaign.id)
+    if error is not None:
+        return f"Failed chunk {chunk.number} of campaign {campaign.id}: {error}"
+    return f"Sent {sent_count} emails for chunk {chunk.number} of campaign {campaign.id}"
+
+
+@shared_task
+def import_orders_csv(import_id: int) -> str:
+    """Import an uploaded order CSV in chunks; progress is readable from the OrderImport row."""
+    order_import = OrderImport.objects.get(id=import_id)
+    if order_import.status == 'done':
+        return f"Import {import_id} already finished"
+    try:
+        run_order_import(order_import)
+    except Exception as e:
+        OrderImport.objects.filter(id=import_id).update(
+            status='failed',
+            error_message=str(e),
+            finished_at=timezone.now(),
+        )
+        print(f"Failed to import orders for import {import_id}: {e}")
+        return f"Failed to import {import_id}: {e}"
+    return f"Imported {order_import.created_count} orders with {order_import.error_count} errors for import {import_id}"
@@ -1,3 +1,161 @@
+import csv
+import shutil
+import tempfile
+from unittest import mock
+
+import requests
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
 from django.test import TestCase
 
-# Create your tests here.
+from .csv_import import run_order_import
+from .mail_batch import LocalTransport, is_rejected, send_batch, split_batches
+from .models import Order, OrderImport
+
+
+class SplitBatchesTests(TestCase):
+    def test_batches_are_capped_at_batch_size(self):
+        batches = split_batches([f'c{i}@example.com' for i in range(5)], email=lambda address: address, batch_size=2)
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+
+    def test_repeated_address_moves_to_a_later_batch(self):
+        batches = split_batches(
+            ['a@example.com', 'A@example.com', 'b@example.com'],
+            email=lambda address: address,
+        )
+        self.assertEqual(batches, [['a@example.com', 'b@example.com'], ['A@example.com']])
+
+
+class SendBatchTests(TestCase):
+    recipients = [
+        ('a@example.com', {'customer_name': 'Ann'}),
+        ('bad@example.com', {'customer_name': 'Bob'}),
+        ('c@example.com', {'customer_name': 'Cid'}),
+    ]
+
+    def setUp(self):
+        LocalTransport.reset()
+        self.addCleanup(LocalTransport.reset)
+        self.transport = LocalTransport()
+
+    def send(self, recipients):
+        return send_batch(self.transport, 'Hi -customer_name-', '<p>-customer_name_html-</p>', '-customer_name-', recipients)
+
+    def test_batch_is_sent_in_one_call(self):
+        self.assertEqual(self.send(self.recipients), [None, None, None])
+        self.assertEqual(LocalTransport.calls, 1)
+        self.assertCountEqual([message['subject'] for message in LocalTransport.outbox], ['Hi Ann', 'Hi Bob', 'Hi Cid'])
+
+    def test_rejected_batch_falls_back_to_one_call_per_recipient(self):
+        LocalTransport.rejected_addresses = {'bad@example.com'}
+
+        outcomes = self.send(self.recipients)
+
+        self.assertIsNone(outcomes[0])
+        self.assertTrue(is_rejected(outcomes[1]))
+        self.assertIsNone(outcomes[2])
+        # The batched call plus one call per recipient
+        self.assertEqual(LocalTransport.calls, 4)
+        self.assertCountEqual([message['to'] for message in LocalTransport.outbox], [['a@example.com'], ['c@example.com']])
+
+    def test_rejected_single_recipient_is_not_resent(self):
+        LocalTransport.rejected_addresses = {'bad@example.com'}
+
+        outcomes = self.send(self.recipients[1:2])
+
+        self.assertTrue(is_rejected(outcomes[0]))
+        self.assertEqual(LocalTransport.calls, 1)
+
+    def test_other_errors_are_raised_without_fallback(self):
+        response = requests.Response()
+        response.status_code = 503
+        with mock.patch.object(self.transport, 'send', side_effect=requests.HTTPError(response=response)) as send:
+            with self.assertRaises(requests.HTTPError):
+                self.send(self.recipients)
+        self.assertEqual(send.call_count, 1)
+
+
+class RunOrderImportTests(TestCase):
+    header = ['Order ID', 'Customer Name', 'Email', 'Phone Number', 'Shipment Date']
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='shop', email='shop@example.com', password='secret', plan='pro',
+        )
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        storage = FileSystemStorage(location=location)
+        for field_name in ('file', 'error_report'):
+            patcher = mock.patch.object(OrderImport._meta.get_field(field_name), 'storage', storage)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_import(self, rows, mode='create'):
+        lines = [','.join(self.header)] + [','.join(row) for row in rows]
+        order_import = OrderImport(user=self.user, mode=mode)
+        order_import.file.save('orders.csv', ContentFile('\n'.join(lines).encode()), save=False)
+        order_import.save()
+        with self.settings(ORDER_IMPORT_CHUNK_SIZE=2):
+            run_order_import(order_import)
+        order_import.refresh_from_db()
+        return order_import
+
+    def error_rows(self, order_import):
+        with order_import.error_report.open('r') as report:
+            return [row for row in csv.reader(report)][1:]
+
+    def test_create_rejects_existing_and_repeated_order_ids(self):
+        Order.objects.create(user=self.user, order_id='A-1', customer_name='Ann', email='a@example.com', phone_number='1')
+
+        order_import = self.run_import([
+            ['A-1', 'Ann Again', 'a@example.com', '1', '2025-01-01'],
+            ['B-1', 'Bob', 'b@example.com', '2', '2025-01-01'],
+            ['C-1', 'Cid', 'c@example.com', '3', '2025-01-01'],
+            ['C-1', 'Cid Again', 'c@example.com', '3', '2025-01-01'],
+            ['B-1', 'Bob Again', 'b@example.com', '2', '2025-01-01'],
+            ['D-1', '', 'd@example.com', '4', '2025-01-01'],
+            ['E-1', 'Eve', 'e@example.com', '5', '01/01/2025'],
+        ])
+
+        self.assertEqual(order_import.status, 'done')
+        self.assertEqual(order_import.processed_rows, 7)
+        self.assertEqual(order_import.created_count, 2)
+        self.assertEqual(order_import.error_count, 5)
+        self.assertEqual(self.error_rows(order_import), [
+            ['2', 'Order ID already exists.'],
+            ['5', 'Duplicate Order ID in file.'],
+            # B-1 was written with the previous chunk
+            ['6', 'Order ID already exists.'],
+            ['7', 'One or more required fields are empty.'],
+            ['8', 'Invalid shipment date format.'],
+        ])
+        self.assertEqual(Order.objects.get(user=self.user, order_id='A-1').customer_name, 'Ann')
+        self.assertEqual(Order.objects.get(user=self.user, order_id='B-1').customer_name, 'Bob')
+
+    def test_upsert_updates_existing_orders_and_keeps_review_state(self):
+        existing = Order.objects.create(
+            user=self.user, order_id='A-1', customer_name='Ann', email='a@example.com',
+            phone_number='1', review_email_sent=True,
+        )
+
+        order_import = self.run_import([
+            ['A-1', 'Ann Updated', 'ann@example.com', '9', '2025-02-02'],
+            ['B-1', 'Bob', 'b@example.com', '2', '2025-01-01'],
+            ['C-1', 'Cid', 'c@example.com', '3', '2025-01-01'],
+            ['C-1', 'Cid Later', 'cid@example.com', '3', '2025-01-03'],
+        ], mode='upsert')
+
+        self.assertEqual(order_import.status, 'done')
+        self.assertEqual(order_import.created_count, 2)
+        self.assertEqual(order_import.updated_count, 2)
+        self.assertEqual(order_import.error_count, 0)
+        self.assertEqual(Order.objects.filter(user=self.user).count(), 3)
+
+        updated = Order.objects.get(user=self.user, order_id='A-1')
+        self.assertEqual(updated.id, existing.id)
+        self.assertEqual((updated.customer_name, updated.email, updated.phone_number), ('Ann Updated', 'ann@example.com', '9'))
+        self.assertEqual(updated.review_token, existing.review_token)
+        self.assertTrue(updated.review_email_sent)
+        # The later row for the same order wins
+        self.assertEqual(Order.objects.get(user=self.user, order_id='C-1').customer_name, 'Cid Later')
@@ -1,6 +1,8 @@
 from django.urls import path
 from .views import (
     upload_orders_csv, 
+    order_import_status,
+    order_import_errors,
     list_user_orders,
     get_monthly_usage,
     get_mailing_history,
@@ -14,6 +16,8 @@ from .views import (
 
 urlpatterns = [
     path('upload-csv/', upload_orders_csv, name='upload_orders_csv'),
+    path('imports/<int:import_id>/', order_import_status, name='order_import_status'),
+    path('imports/<int:import_id>/errors/', order_import_errors, name='order_import_errors'),
     path('my-orders/', list_user_orders, name='list_user_orders'),
     
     # Manual Mailing URLs
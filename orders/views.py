@@ -1,21 +1,21 @@
-import csv
-from io import TextIOWrapper
 from rest_framework.decorators import api_view, parser_classes, permission_classes
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
-import datetime
 from django.utils import timezone
 from django.db import transaction
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
 from django.urls import reverse
+from django.http import FileResponse
 import sendgrid
 from sendgrid.helpers.mail import Mail
 from django.conf import settings
 from celery import shared_task
 
-from .models import Order, MailingCampaign, MailingRecipient, MailingTemplate, MailingUsage
-from .tasks import send_mailing_emails
+from .models import Order, MailingCampaign, MailingRecipient, MailingTemplate, MailingUsage, OrderImport
+from .tasks import send_mailing_emails, import_orders_csv
 from utils.utitily import is_trial_active, is_plan_active
 
 @api_view(['POST'])
@@ -32,57 +32,67 @@ def upload_orders_csv(request):
     elif (is_trial_active(user) and monthly_count<limit) or monthly_count < limit: 
         if 'file' not in request.FILES:
             return Response({'error': 'No file uploaded.'}, status=status.HTTP_400_BAD_REQUEST)
-        file = request.FILES['file']
-        try:
-            decoded_file = TextIOWrapper(file, encoding='utf-8')
-            reader = csv.DictReader(decoded_file)
-        except Exception as e:
-            return Response({'error': 'Invalid CSV file.'}, status=status.HTTP_400_BAD_REQUEST)
-
-        required_fields = ['Order ID', 'Customer Name', 'Email', 'Phone Number', 'Shipment Date']
-        created = 0
-        errors = []
-        for idx, row in enumerate(reader, start=2):  # start=2 to account for header row
-            # Check for missing columns
-            if not all(field in row for field in required_fields):
-                errors.append(f"Row {idx}: Missing required columns.")
-                continue
-
-            # Handle null/empty values
-            order_id = row.get('Order ID', '').strip()
-            customer_name = row.get('Customer Name', '').strip()
-            email = row.get('Email', '').strip()
-            phone_number = row.get('Phone Number', '').strip()
-
-            if not order_id or not customer_name or not email or not phone_number:
-                errors.append(f"Row {idx}: One or more required fields are empty.")
-                continue
-
-            shipment_date_str = row.get('Shipment Date')
-            try:
-                shipment_date = datetime.datetime.strptime(shipment_date_str, '%Y-%m-%d').date() if shipment_date_str else None
-            except Exception:
-                errors.append(f"Row {idx}: Invalid shipment date format.")
-                continue
-
-            try:
-                order = Order.objects.create(
-                    user=request.user,
-                    order_id=order_id,
-                    customer_name=customer_name,
-                    email=email,
-                    phone_number=phone_number,
-                    shipment_date=shipment_date,
-                )
-                created += 1
-            except Exception as e:
-                errors.append(f"Row {idx}: Failed to create order. Error: {str(e)}")
-                continue
-
-        response_data = {'message': f'{created} orders uploaded successfully.'}
-        if errors:
-            response_data['errors'] = errors
-        return Response(response_data, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+        mode = request.data.get('mode') or 'create'
+        if mode not in dict(OrderImport.MODE_CHOICES):
+            return Response({'error': "Invalid mode. Use 'create' or 'upsert'."}, status=status.HTTP_400_BAD_REQUEST)
+        # The upload is stored and imported in the background; poll the progress endpoint
+        order_import = OrderImport.objects.create(user=user, file=request.FILES['file'], mode=mode)
+        transaction.on_commit(lambda: import_orders_csv.delay(order_import.id))
+        return Response({
+            'message': 'Order import started.',
+            'import_id': order_import.id,
+            'status': order_import.status,
+            'progress_url': reverse('order_import_status', args=[order_import.id]),
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+def _order_import_data(order_import):
+    data = {
+        'import_id': order_import.id,
+        'mode': order_import.mode,
+        'status': order_import.status,
+        'processed_rows': order_import.processed_rows,
+        'created': order_import.created_count,
+        'updated': order_import.updated_count,
+        'errors': order_import.error_count,
+        'rows_per_second': order_import.rows_per_second,
+        'created_at': order_import.created_at,
+        'started_at': order_import.started_at,
+        'finished_at': order_import.finished_at,
+        'error_report_url': None,
+    }
+    if order_import.error_report:
+        data['error_report_url'] = reverse('order_import_errors', args=[order_import.id])
+    if order_import.error_message:
+        data['error_message'] = order_import.error_message
+    return data
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def order_import_status(request, import_id):
+    try:
+        order_import = OrderImport.objects.get(id=import_id, user=request.user)
+    except OrderImport.DoesNotExist:
+        return Response({'error': 'Import not found.'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(_order_import_data(order_import))
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def order_import_errors(request, import_id):
+    try:
+        order_import = OrderImport.objects.get(id=import_id, user=request.user)
+    except OrderImport.DoesNotExist:
+        return Response({'error': 'Import not found.'}, status=status.HTTP_404_NOT_FOUND)
+    if not order_import.error_report:
+        return Response({'error': 'This import has no error report.'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(
+        order_import.error_report.open('rb'),
+        as_attachment=True,
+        filename=f"order-import-{order_import.id}-errors.csv",
+        content_type='text/csv',
+    )
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -157,6 +167,43 @@ def get_mailing_history(request):
     return Response({'history': history})
 
 
+RECIPIENT_BATCH_SIZE = 1000
+
+
+def _clean_recipients(recipients):
+    """
+    Validate recipient rows and drop duplicate emails (campaign + email is unique).
+    Returns (valid_rows, errors) where errors are per-row messages.
+    """
+    valid = []
+    errors = []
+    seen_emails = set()
+    for i, recipient in enumerate(recipients):
+        if not isinstance(recipient, dict):
+            errors.append(f"Recipient {i+1}: Invalid recipient data")
+            continue
+        email = str(recipient.get('email') or '').strip()
+        if not email:
+            errors.append(f"Recipient {i+1}: Email is required")
+            continue
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append(f"Recipient {i+1}: Invalid email format")
+            continue
+        if email.lower() in seen_emails:
+            errors.append(f"Recipient {i+1}: Duplicate email {email}")
+            continue
+        seen_emails.add(email.lower())
+        valid.append({
+            'email': email,
+            'name': str(recipient.get('name') or '')[:100],
+            'order_number': str(recipient.get('orderNumber') or '')[:50],
+            'country': str(recipient.get('country') or '')[:100],
+        })
+    return valid, errors
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def send_mailing(request):
@@ -182,6 +229,15 @@ def send_mailing(request):
             'message': f'Too many recipients. Plan allows maximum {limits["email_limit"]} emails per mailing'
         }, status=status.HTTP_400_BAD_REQUEST)
     
+    # Validate and de-duplicate rows up front; bad rows are reported, not fatal
+    valid_recipients, invalid_recipients = _clean_recipients(recipients)
+    if not valid_recipients:
+        return Response({
+            'success': False,
+            'message': 'No valid recipients provided',
+            'errors': invalid_recipients,
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
     try:
         with transaction.atomic():
             # Create campaign
@@ -189,28 +245,36 @@ def send_mailing(request):
                 user=user,
                 subject=template.get('subject', ''),
                 body=template.get('body', ''),
-                recipients_count=len(recipients),
+                recipients_count=len(valid_recipients),
                 status='sending'
             )
             
-            # Create recipients
-            for recipient_data in recipients:
-                MailingRecipient.objects.create(
-                    campaign=campaign,
-                    email=recipient_data['email'],
-                    name=recipient_data.get('name', ''),
-                    order_number=recipient_data.get('orderNumber', ''),
-                    country=recipient_data.get('country', '')
-                )
+            # Create recipients in batched INSERTs
+            MailingRecipient.objects.bulk_create(
+                [
+                    MailingRecipient(
+                        campaign=campaign,
+                        email=recipient_data['email'],
+                        name=recipient_data['name'],
+                        order_number=recipient_data['order_number'],
+                        country=recipient_data['country'],
+                    )
+                    for recipient_data in valid_recipients
+                ],
+                batch_size=RECIPIENT_BATCH_SIZE,
+            )
             
-            # Start sending emails asynchronously (registered Celery task)
-            send_mailing_emails.delay(campaign.id)
+            # Start sending emails asynchronously once the recipients are committed
+            transaction.on_commit(lambda: send_mailing_emails.delay(campaign.id))
             
-            return Response({
-                'success': True,
-                'mailingId': campaign.id,
-                'message': f'Mailing started for {len(recipients)} recipients'
-            })
+        response_data = {
+            'success': True,
+            'mailingId': campaign.id,
+            'message': f'Mailing started for {len(valid_recipients)} recipients'
+        }
+        if invalid_recipients:
+            response_data['errors'] = invalid_recipients
+        return Response(response_data)
             
     except Exception as e:
         return Response({
@@ -301,14 +365,7 @@ def preview_email(request):
 def validate_recipients(request):
     """Validate recipient emails"""
     recipients = request.data.get('recipients', [])
-    errors = []
-    
-    for i, recipient in enumerate(recipients):
-        email = recipient.get('email', '').strip()
-        if not email:
-            errors.append(f"Recipient {i+1}: Email is required")
-        elif '@' not in email:
-            errors.append(f"Recipient {i+1}: Invalid email format")
+    _, errors = _clean_recipients(recipients)
     
     return Response({
         'valid': len(errors) == 0,
@@ -10,11 +10,15 @@ app.autodiscover_tasks()
 
 app.conf.beat_schedule = {
     'send-scheduled-review-emails-daily': {
-        'task': 'rcs.orders.tasks.send_scheduled_review_emails',
+        'task': 'orders.tasks.send_scheduled_review_emails',
         'schedule': crontab(hour=0, minute=0),  # runs daily at midnight
     },
-    'auto-publish-reviews-daily': {
-        'task': 'rcs.reviews.tasks.periodic_auto_publish_reviews',
-        'schedule': crontab(hour=1, minute=0),  # runs daily at 1am
+    'auto-publish-reviews-every-hour': {
+        'task': 'reviews.tasks.periodic_auto_publish_reviews',
+        'schedule': crontab(minute=0, hour='*'),  # publishes reviews whose auto_publish_at has passed
+    },
+    'flush-widget-impressions-every-minute': {
+        'task': 'users.tasks.flush_widget_impressions',
+        'schedule': crontab(minute='*'),  # moves buffered widget impressions into the DB
     },
 }
@@ -108,6 +108,22 @@ DATABASES = {
     }
 }
 
+# Cache (shared across web and Celery workers)
+CACHES = {
+    'default': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.environ.get('REDIS_CACHE_URL', 'redis://redis:6379/1'),
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+            # Degrade to cache misses instead of erroring if Redis is unavailable
+            'IGNORE_EXCEPTIONS': True,
+        },
+    }
+}
+
+# Rendered iframe widget lifetime; entries are also invalidated by version bumps
+WIDGET_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -203,4 +219,55 @@ EMAIL_HOST_USER = 'apikey'  # This is always 'apikey' for SendGrid
 EMAIL_HOST_PASSWORD = os.environ.get('SENDGRID_API_KEY')
 DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'noreply@level-4u.com')
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'https://www.level-4u.com')
-GOOGLE_TRANSLATE_API_KEY = os.environ.get('GOOGLE_TRANSLATE_API_KEY')
\ No newline at end of file
+GOOGLE_TRANSLATE_API_KEY = os.environ.get('GOOGLE_TRANSLATE_API_KEY')
+
+# Manual mailing dispatch: recipients per Celery subtask, send threads per subtask,
+# and the global SendGrid send rate shared by all workers
+MAILING_CHUNK_SIZE = int(os.environ.get('MAILING_CHUNK_SIZE', 100))
+MAILING_SEND_CONCURRENCY = int(os.environ.get('MAILING_SEND_CONCURRENCY', 8))
+MAILING_RATE_LIMIT_PER_SECOND = int(os.environ.get('MAILING_RATE_LIMIT_PER_SECOND', 50))
+# Transport used for batched SendGrid sends; set to 'orders.mail_batch.LocalTransport'
+# to keep messages in memory for offline testing
+MAIL_TRANSPORT = os.environ.get('MAIL_TRANSPORT', 'orders.mail_batch.SendGridTransport')
+
+# Per-process translation LRU size; entries are also kept without expiry in the shared cache
+TRANSLATION_LOCAL_CACHE_SIZE = int(os.environ.get('TRANSLATION_LOCAL_CACHE_SIZE', 2048))
+
+# Window in seconds for merging concurrent translation misses into one API request
+TRANSLATION_BATCH_WINDOW = float(os.environ.get('TRANSLATION_BATCH_WINDOW', 0.02))
+
+# Order CSV imports: uploaded files and error reports are kept on a volume
+# shared by the web and Celery containers; rows are inserted in chunks
+ORDER_IMPORT_ROOT = os.environ.get('ORDER_IMPORT_ROOT', '/var/www/imports')
+ORDER_IMPORT_CHUNK_SIZE = int(os.environ.get('ORDER_IMPORT_CHUNK_SIZE', 2000))
+
+# Review request emails go out REVIEW_EMAIL_DELAY_DAYS after shipment; orders missed
+# by up to REVIEW_EMAIL_CATCHUP_DAYS earlier runs are included, in per-merchant chunks
+REVIEW_EMAIL_DELAY_DAYS = int(os.environ.get('REVIEW_EMAIL_DELAY_DAYS', 5))
+REVIEW_EMAIL_CATCHUP_DAYS = int(os.environ.get('REVIEW_EMAIL_CATCHUP_DAYS', 7))
+REVIEW_EMAIL_CHUNK_SIZE = int(os.environ.get('REVIEW_EMAIL_CHUNK_SIZE', 1000))
+
+# Outbound HTTP (SendGrid, Google Translate) shares one keep-alive session per process.
+# Connection pool size per host; keep SendGrid's at or above MAILING_SEND_CONCURRENCY
+HTTP_CLIENT_POOL_SIZES = {
+    'api.sendgrid.com': int(os.environ.get('SENDGRID_HTTP_POOL_SIZE', 16)),
+    'translation.googleapis.com': int(os.environ.get('TRANSLATE_HTTP_POOL_SIZE', 8)),
+}
+# Retries of failed connections and 429/502/503/504 responses, with jittered exponential backoff
+HTTP_CLIENT_RETRIES = int(os.environ.get('HTTP_CLIENT_RETRIES', 3))
+HTTP_CLIENT_BACKOFF = float(os.environ.get('HTTP_CLIENT_BACKOFF', 0.2))
+HTTP_CLIENT_BACKOFF_JITTER = float(os.environ.get('HTTP_CLIENT_BACKOFF_JITTER', 0.2))
+HTTP_CLIENT_TIMEOUT = float(os.environ.get('HTTP_CLIENT_TIMEOUT', 10))
+# Seconds between per-process logs of the outbound latency histogram; 0 turns them off
+HTTP_CLIENT_STATS_LOG_INTERVAL = int(os.environ.get('HTTP_CLIENT_STATS_LOG_INTERVAL', 300))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'utils.http_client': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
@@ -1,11 +1,11 @@
 from django.contrib import admin
-from .models import Review, Branch
+from .models import Review, Branch, ReviewAggregate
 
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ['id', 'user', 'source', 'branch', 'recommend', 'main_rating', 'is_published', 'created_at']
-    list_filter = ['source', 'recommend', 'is_published', 'is_flagged_red', 'created_at']
+    list_display = ['id', 'user', 'source', 'channel', 'branch', 'recommend', 'main_rating', 'is_published', 'created_at']
+    list_filter = ['source', 'channel', 'recommend', 'is_published', 'is_flagged_red', 'created_at']
     search_fields = ['user__username', 'user__email', 'manual_customer_name', 'comment']
     readonly_fields = ['id', 'created_at']
     ordering = ['-created_at']
@@ -18,3 +18,10 @@ class BranchAdmin(admin.ModelAdmin):
     search_fields = ['name', 'user__username', 'user__email', 'token']
     readonly_fields = ['id', 'token', 'created_at', 'updated_at']
     ordering = ['-created_at']
+
+
+@admin.register(ReviewAggregate)
+class ReviewAggregateAdmin(admin.ModelAdmin):
+    list_display = ['user', 'total_count', 'positive_count', 'main_rating_sum', 'main_rating_count', 'updated_at']
+    search_fields = ['user__username', 'user__email']
+    readonly_fields = ['updated_at']
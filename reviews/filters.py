@@ -1,6 +1,6 @@
 import django_filters
 from .models import Review
-from django.db import models
+from .search import search_reviews
 
 class ReviewFilter(django_filters.FilterSet):
     min_rating = django_filters.NumberFilter(field_name='main_rating', lookup_expr='gte')
@@ -9,6 +9,7 @@ class ReviewFilter(django_filters.FilterSet):
     communication_rating = django_filters.NumberFilter(field_name='communication_rating')
     website_usability_rating = django_filters.NumberFilter(field_name='website_usability_rating')
     recommend = django_filters.CharFilter(field_name='recommend')
+    channel = django_filters.ChoiceFilter(field_name='channel', choices=Review.CHANNEL_CHOICES)
     start_date = django_filters.DateFilter(field_name='created_at', lookup_expr='gte')
     end_date = django_filters.DateFilter(field_name='created_at', lookup_expr='lte')
     status = django_filters.CharFilter(method='filter_status')
@@ -41,8 +42,5 @@ class ReviewFilter(django_filters.FilterSet):
         return queryset
 
     def filter_search(self, queryset, name, value):
-        return queryset.filter(
-            models.Q(order__order_id__icontains=value) |
-            models.Q(order__customer_name__icontains=value) |
-            models.Q(comment__icontains=value)
-        )
\ No newline at end of file
+        # Ranked full-text search; explicit sort_by still takes precedence
+        return search_reviews(queryset, value, user=getattr(self.request, 'user', None))
\ No newline at end of file
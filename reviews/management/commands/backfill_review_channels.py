@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from orders.models import MailingRecipient
+from reviews.models import Review
+
+
+class Command(BaseCommand):
+    help = 'Backfill Review.channel for reviews created before the channel was recorded'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Reviews classified and updated per batch (default: 1000)',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        mailing_emails = {}
+        updated = 0
+        last_id = None
+
+        while True:
+            # Rows created since the channel is recorded on write already hold their real channel;
+            # only rows still on the default are reclassified
+            batch = Review.objects.filter(channel='online').order_by('id').values_list(
+                'id', 'user_id', 'source', 'order_id', 'order__email', 'manual_order_id', 'manual_customer_name',
+            )
+            if last_id is not None:
+                batch = batch.filter(id__gt=last_id)
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1][0]
+
+            changes = {}
+            for review_id, user_id, source, order_id, order_email, manual_order_id, manual_customer_name in batch:
+                if user_id not in mailing_emails:
+                    mailing_emails[user_id] = set(
+                        MailingRecipient.objects.filter(campaign__user_id=user_id, status='reviewed')
+                        .values_list('email', flat=True)
+                    )
+                # Same classification the dashboard used to compute on every read
+                if source == 'offline':
+                    new_channel = 'offline'
+                elif order_id:
+                    new_channel = 'manual_mailing' if order_email in mailing_emails[user_id] else 'online'
+                elif manual_order_id or manual_customer_name:
+                    new_channel = 'manual_review'
+                else:
+                    new_channel = 'online'
+                if new_channel != 'online':
+                    changes.setdefault(new_channel, []).append(review_id)
+
+            # At most one UPDATE per channel per batch
+            for new_channel, review_ids in changes.items():
+                updated += Review.objects.filter(id__in=review_ids).update(channel=new_channel)
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled channel on {updated} reviews'))
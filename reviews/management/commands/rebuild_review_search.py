@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from reviews.models import Review
+from reviews.search import refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search vector of every review in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Reviews updated per statement (default: 1000)',
+        )
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Only reviews that have no search vector yet',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        reviews = Review.objects.order_by('id')
+        if options['missing_only']:
+            reviews = reviews.filter(search_vector__isnull=True)
+
+        rebuilt = 0
+        last_id = None
+        while True:
+            batch = reviews if last_id is None else reviews.filter(id__gt=last_id)
+            review_ids = list(batch.values_list('id', flat=True)[:batch_size])
+            if not review_ids:
+                break
+            last_id = review_ids[-1]
+            refresh_search_vectors(review_ids)
+            rebuilt += len(review_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search vectors for {rebuilt} reviews'))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from users.models import BusinessCategory
+from reviews.views import _build_public_strings, _get_localized_category_questions
+from utils.translation_service import translation_cache_stats
+
+
+class Command(BaseCommand):
+    help = 'Pre-warm the shared translation cache with category labels and UI strings'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--languages',
+            nargs='+',
+            default=['cs', 'sk'],
+            help='Target language codes to warm (default: cs sk)',
+        )
+
+    def handle(self, *args, **options):
+        category_names = set(BusinessCategory.get_default_questions())
+        category_names.update(BusinessCategory.objects.values_list('name', flat=True))
+
+        for language_code in options['languages']:
+            _build_public_strings(language_code, wait=True)
+            for category_name in sorted(category_names):
+                _get_localized_category_questions(category_name, language_code, wait=True)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Warmed UI strings and {len(category_names)} category label sets for {language_code}'
+                )
+            )
+
+        stats = translation_cache_stats()
+        for scope in ('process', 'shared'):
+            counters = ', '.join(f'{name}={count}' for name, count in stats[scope].items())
+            self.stdout.write(f'{scope}: {counters}')
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_review_manual_customer_address'),
+        ('users', '0010_customuser_business_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReviewAggregate',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_aggregate', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_count', models.PositiveIntegerField(default=0)),
+                ('positive_count', models.PositiveIntegerField(default=0)),
+                ('main_rating_sum', models.PositiveIntegerField(default=0)),
+                ('main_rating_count', models.PositiveIntegerField(default=0)),
+                ('logistics_rating_sum', models.PositiveIntegerField(default=0)),
+                ('logistics_rating_count', models.PositiveIntegerField(default=0)),
+                ('communication_rating_sum', models.PositiveIntegerField(default=0)),
+                ('communication_rating_count', models.PositiveIntegerField(default=0)),
+                ('website_usability_rating_sum', models.PositiveIntegerField(default=0)),
+                ('website_usability_rating_count', models.PositiveIntegerField(default=0)),
+                ('star_1_count', models.PositiveIntegerField(default=0)),
+                ('star_2_count', models.PositiveIntegerField(default=0)),
+                ('star_3_count', models.PositiveIntegerField(default=0)),
+                ('star_4_count', models.PositiveIntegerField(default=0)),
+                ('star_5_count', models.PositiveIntegerField(default=0)),
+                ('category_name', models.CharField(blank=True, max_length=50)),
+                ('category_totals', models.JSONField(blank=True, default=dict)),
+                ('latest_comment', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Review aggregate',
+                'verbose_name_plural': 'Review aggregates',
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_add_country_to_mailing_recipient'),
+        ('reviews', '0008_reviewaggregate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'is_published', '-created_at', '-id'], name='review_user_pub_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_mailingchunk'),
+        ('reviews', '0009_review_user_pub_keyset_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='channel',
+            field=models.CharField(choices=[('online', 'Online'), ('manual_mailing', 'Manual Mailing'), ('offline', 'Offline (QR)'), ('manual_review', 'Manual Review')], default='online', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', 'channel'], name='review_user_channel_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0008_order_order_id_trgm'),
+        ('reviews', '0010_review_channel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='review_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('manual_order_id'), name='gin_trgm_ops'), name='review_manual_order_trgm_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.4 on 2026-10-17 19:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0011_order_review_due_idx'),
+        ('reviews', '0011_review_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('is_published', False)), fields=['auto_publish_at'], name='review_auto_publish_due_idx'),
+        ),
+    ]
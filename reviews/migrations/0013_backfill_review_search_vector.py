@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+# Same statement as reviews.search.refresh_search_vectors, frozen here
+REFRESH_SQL = """
+    UPDATE reviews_review AS review
+    SET search_vector =
+        setweight(to_tsvector('simple', coalesce(o.order_id, review.manual_order_id, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(o.customer_name, review.manual_customer_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(review.comment, '')), 'C')
+    FROM reviews_review AS source
+    LEFT JOIN orders_order AS o ON o.id = source.order_id
+    WHERE source.id = review.id AND review.id = ANY(%s::uuid[])
+"""
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Build the search vector of every review written before the column existed, in batches"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    Review = apps.get_model('reviews', 'Review')
+    reviews = Review.objects.filter(search_vector__isnull=True).order_by('id')
+    last_id = None
+    while True:
+        batch = reviews if last_id is None else reviews.filter(id__gt=last_id)
+        review_ids = [str(review_id) for review_id in batch.values_list('id', flat=True)[:BATCH_SIZE]]
+        if not review_ids:
+            break
+        last_id = review_ids[-1]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(REFRESH_SQL, [review_ids])
+
+
+class Migration(migrations.Migration):
+    # Each batch commits on its own instead of holding row locks on the whole table
+    atomic = False
+
+    dependencies = [
+        ('reviews', '0012_review_auto_publish_due_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
+from django.contrib.postgres.search import SearchVectorField
 from orders.models import Order
 from django.utils import timezone
 import uuid
@@ -58,10 +61,19 @@ class Review(models.Model):
         ('offline', 'Offline (QR)'),
     ]
 
+    # Channel the review was collected through, recorded when the review is created
+    CHANNEL_CHOICES = [
+        ('online', 'Online'),
+        ('manual_mailing', 'Manual Mailing'),
+        ('offline', 'Offline (QR)'),
+        ('manual_review', 'Manual Review'),
+    ]
+
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='reviews', null=True, blank=True)
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews')
     branch = models.ForeignKey(Branch, on_delete=models.SET_NULL, related_name='reviews', null=True, blank=True)  # For offline reviews
     source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default='online')  # online or offline
+    channel = models.CharField(max_length=20, choices=CHANNEL_CHOICES, default='online')
     manual_order_id = models.CharField(max_length=100, blank=True, null=True)
     manual_customer_name = models.CharField(max_length=200, blank=True, null=True)
     manual_customer_email = models.CharField(max_length=200, blank=True, null=True)
@@ -81,6 +93,21 @@ class Review(models.Model):
     auto_publish_at = models.DateTimeField(null=True, blank=True)
     reply = models.TextField(blank=True)  # Store/admin reply to review
     id = models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True)
+    # Maintained by reviews.search.refresh_search_vectors after every save
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of a business's published reviews, newest first
+            models.Index(fields=['user', 'is_published', '-created_at', '-id'], name='review_user_pub_keyset_idx'),
+            # Dashboard filters and stats grouped by collection channel
+            models.Index(fields=['user', 'channel'], name='review_user_channel_idx'),
+            # Dashboard search: ranked full-text matches and substring matches on manual order ids
+            GinIndex(fields=['search_vector'], name='review_search_vector_idx'),
+            GinIndex(OpClass(Upper('manual_order_id'), name='gin_trgm_ops'), name='review_manual_order_trgm_idx'),
+            # Hourly auto-publish sweep; only unpublished reviews are indexed
+            models.Index(fields=['auto_publish_at'], condition=models.Q(is_published=False), name='review_auto_publish_due_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         # If recommend is yes, calculate main_rating from sub-ratings
@@ -156,7 +183,9 @@ class Review(models.Model):
             # Set auto-publish time if not already set
             if not self.auto_publish_at:
                 self.auto_publish_at = timezone.now() + timezone.timedelta(days=7)
-            self.is_published = self.is_complete  # Only publish if complete
+            # Only publish if complete, or once the auto-publish time has passed
+            # (matches the reviews.tasks.auto_publish_reviews sweep)
+            self.is_published = self.is_complete or self.auto_publish_at <= timezone.now()
         super().save(*args, **kwargs)
 
     @property
@@ -172,3 +201,131 @@ class Review(models.Model):
         else:
             order_info = " (Manual Review)"
         return f"Review by {self.user}{order_info} - {'Recommend' if self.recommend == 'yes' else 'Not Recommend'}"
+
+
+class ReviewAggregate(models.Model):
+    """Precomputed rating summary of a business's published reviews (one row per business)"""
+    RATING_FIELDS = ['main_rating', 'logistics_rating', 'communication_rating', 'website_usability_rating']
+
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='review_aggregate', primary_key=True)
+    total_count = models.PositiveIntegerField(default=0)
+    positive_count = models.PositiveIntegerField(default=0)
+    main_rating_sum = models.PositiveIntegerField(default=0)
+    main_rating_count = models.PositiveIntegerField(default=0)
+    logistics_rating_sum = models.PositiveIntegerField(default=0)
+    logistics_rating_count = models.PositiveIntegerField(default=0)
+    communication_rating_sum = models.PositiveIntegerField(default=0)
+    communication_rating_count = models.PositiveIntegerField(default=0)
+    website_usability_rating_sum = models.PositiveIntegerField(default=0)
+    website_usability_rating_count = models.PositiveIntegerField(default=0)
+    # Histogram of main_rating (1-5 stars)
+    star_1_count = models.PositiveIntegerField(default=0)
+    star_2_count = models.PositiveIntegerField(default=0)
+    star_3_count = models.PositiveIntegerField(default=0)
+    star_4_count = models.PositiveIntegerField(default=0)
+    star_5_count = models.PositiveIntegerField(default=0)
+    # Business category the category totals were computed for
+    category_name = models.CharField(max_length=50, blank=True)
+    # {field: {'sum': float, 'count': int}} for each category question
+    category_totals = models.JSONField(default=dict, blank=True)
+    latest_comment = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Review aggregate'
+        verbose_name_plural = 'Review aggregates'
+
+    def __str__(self):
+        return f"Aggregate for {self.user} - {self.total_count} reviews"
+
+    @property
+    def star_histogram(self):
+        """Count of published reviews per main_rating star level, 5 to 1"""
+        return {level: getattr(self, f'star_{level}_count') for level in [5, 4, 3, 2, 1]}
+
+    @property
+    def positive_percentage(self):
+        return round((self.positive_count / self.total_count * 100), 0) if self.total_count > 0 else 0
+
+    def average(self, field, digits=2):
+        """Average of a standard rating field (e.g. 'main_rating'), None if no values; digits=None skips rounding"""
+        total = getattr(self, f'{field}_sum')
+        count = getattr(self, f'{field}_count')
+        if not count:
+            return None
+        return total / count if digits is None else round(total / count, digits)
+
+    def category_average(self, field, digits=1):
+        """Return (average, count) for a category question field"""
+        totals = self.category_totals.get(field) or {}
+        count = totals.get('count', 0)
+        return (round(totals.get('sum', 0) / count, digits) if count else 0), count
+
+    @staticmethod
+    def _category_fields(user):
+        if not user.business_category_id:
+            return '', []
+        from users.models import BusinessCategory
+        category_name = user.business_category.name
+        questions = BusinessCategory.get_default_questions().get(category_name, [])
+        return category_name, [question['field'] for question in questions]
+
+    @classmethod
+    def refresh_for_user(cls, user):
+        """Recompute the aggregate for a business with a single aggregate query"""
+        from django.db.models import Count, FloatField, Q, Sum
+        from django.db.models.fields.json import KeyTextTransform
+        from django.db.models.functions import Cast
+
+        category_name, category_fields = cls._category_fields(user)
+        published = Review.objects.filter(user=user, is_published=True)
+
+        expressions = {
+            'total_count': Count('id'),
+            'positive_count': Count('id', filter=Q(recommend='yes')),
+        }
+        for field in cls.RATING_FIELDS:
+            expressions[f'{field}_sum'] = Sum(field)
+            expressions[f'{field}_count'] = Count(field)
+        for level in range(1, 6):
+            expressions[f'star_{level}_count'] = Count('id', filter=Q(main_rating=level))
+        for index, field in enumerate(category_fields):
+            # Mirrors the widget rule: only ratings > 0 take part in the average
+            rated = Q(**{f'category_ratings__{field}__gt': 0})
+            value = Cast(KeyTextTransform(field, 'category_ratings'), FloatField())
+            expressions[f'category_{index}_sum'] = Sum(value, filter=rated)
+            expressions[f'category_{index}_count'] = Count('id', filter=rated)
+
+        result = published.aggregate(**expressions)
+
+        defaults = {
+            'category_name': category_name,
+            'category_totals': {
+                field: {
+                    'sum': result.pop(f'category_{index}_sum') or 0,
+                    'count': result.pop(f'category_{index}_count'),
+                }
+                for index, field in enumerate(category_fields)
+            },
+            'latest_comment': published.order_by('-created_at').values_list('comment', flat=True).first() or '',
+        }
+        defaults.update({key: value or 0 for key, value in result.items()})
+        aggregate, _ = cls.objects.update_or_create(user=user, defaults=defaults)
+        return aggregate
+
+    @classmethod
+    def refresh_for_user_ids(cls, user_ids):
+        """Refresh aggregates for the given business ids, skipping ones that no longer exist"""
+        from django.contrib.auth import get_user_model
+        users = get_user_model().objects.filter(id__in=set(user_ids)).select_related('business_category')
+        for user in users:
+            cls.refresh_for_user(user)
+
+    @classmethod
+    def for_user(cls, user):
+        """Return the aggregate for a business, building it on first use or after a category change"""
+        aggregate = cls.objects.filter(user=user).first()
+        current_category = user.business_category.name if user.business_category_id else ''
+        if aggregate is None or aggregate.category_name != current_category:
+            aggregate = cls.refresh_for_user(user)
+        return aggregate
@@ -351,6 +351,7 @@ def submit_offline_review(request, token):
         user=user,
         branch=branch,
         source='offline',
+        channel='offline',
         recommend=recommend,
         comment=comment,
         manual_customer_name=customer_name or 'Anonymous',
@@ -474,6 +475,7 @@ def offline_review_form(request, token):
                 user=company,
                 branch=branch,
                 source='offline',
+                channel='offline',
                 recommend='yes',
                 comment=comment,
                 manual_customer_name=customer_name or 'Anonymous',
@@ -495,6 +497,7 @@ def offline_review_form(request, token):
                 user=company,
                 branch=branch,
                 source='offline',
+                channel='offline',
                 recommend='no',
                 comment=comment,
                 manual_customer_name=customer_name or 'Anonymous',
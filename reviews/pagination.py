@@ -0,0 +1,50 @@
+"""
+Keyset (cursor) pagination over reviews ordered newest first.
+
+Cursors encode the (created_at, id) of the last row on a page, so fetching
+the next page is an index range scan instead of an OFFSET that grows with
+the page number.
+"""
+import base64
+import datetime
+import uuid
+
+from django.db.models import Q
+
+KEYSET_ORDERING = ('-created_at', '-id')
+
+
+def encode_cursor(review):
+    """Cursor for a review instance or a .values() row containing created_at and id"""
+    if isinstance(review, dict):
+        created_at, review_id = review['created_at'], review['id']
+    else:
+        created_at, review_id = review.created_at, review.id
+    raw = f"{created_at.isoformat()}|{review_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return (created_at, id) for a cursor; raises ValueError if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, review_id = base64.urlsafe_b64decode(padded.encode()).decode().split('|', 1)
+        return datetime.datetime.fromisoformat(created_at), uuid.UUID(review_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def paginate_keyset(queryset, cursor=None, page_size=20):
+    """Return (items, next_cursor) for the page after `cursor` (newest first)"""
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    if cursor:
+        created_at, review_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=review_id)
+        )
+    items = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(items) > page_size:
+        items = items[:page_size]
+        next_cursor = encode_cursor(items[-1])
+    return items, next_cursor
@@ -0,0 +1,71 @@
+"""
+Full-text search over reviews.
+
+Each review keeps a tsvector built from its order id (weight A), customer
+name (weight B) and comment (weight C). The 'simple' configuration is used
+because reviews are written in several languages. Order id and customer name
+come from the linked order when there is one, otherwise from the manual
+fields, so the vector is rebuilt in SQL with a join to orders_order.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+
+from orders.models import Order
+
+SEARCH_CONFIG = 'simple'
+
+_REFRESH_SQL = """
+    UPDATE reviews_review AS review
+    SET search_vector =
+        setweight(to_tsvector('simple', coalesce(o.order_id, review.manual_order_id, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(o.customer_name, review.manual_customer_name, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(review.comment, '')), 'C')
+    FROM reviews_review AS source
+    LEFT JOIN orders_order AS o ON o.id = source.order_id
+    WHERE source.id = review.id AND review.id = ANY(%s::uuid[])
+"""
+
+_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def refresh_search_vectors(review_ids):
+    """Rebuild the search vector of the given reviews with one UPDATE"""
+    review_ids = [str(review_id) for review_id in review_ids]
+    if not review_ids or connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(_REFRESH_SQL, [review_ids])
+
+
+def _matching_order_ids(value, user=None):
+    """Ids of the orders whose order id contains `value`, looked up on orders_order alone"""
+    orders = Order.objects.filter(order_id__icontains=value)
+    if user is not None:
+        orders = orders.filter(user=user)
+    return orders.values('id')
+
+
+def search_reviews(queryset, value, user=None):
+    """
+    Filter reviews matching every term of `value` (as word prefixes) and order them by rank.
+    Order ids also match on any substring through the trigram indexes; pass the reviews'
+    owner as `user` so that lookup only scans their orders.
+    """
+    terms = _TERM_RE.findall(value)
+    if not terms:
+        return queryset
+
+    # Terms are plain word characters, so the raw prefix query cannot be malformed
+    query = SearchQuery(' & '.join(f"{term}:*" for term in terms), search_type='raw', config=SEARCH_CONFIG)
+    # Each condition stays on a single table, so the planner can OR together the GIN and
+    # trigram index scans instead of joining orders_order for every candidate review
+    return queryset.filter(
+        Q(search_vector=query) |
+        Q(order_id__in=_matching_order_ids(value, user)) |
+        Q(manual_order_id__icontains=value)
+    ).annotate(
+        search_rank=SearchRank(F('search_vector'), query)
+    ).order_by('-search_rank', '-created_at')
@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders.models import Order
+from users.models import BusinessCategory, CustomUser
+from .models import Review, ReviewAggregate
+from .search import refresh_search_vectors
+from .widget_cache import bump_widget_version
+
+
+def _refresh_review_summary(user_id):
+    ReviewAggregate.refresh_for_user_ids([user_id])
+    # Bump after the aggregate is rebuilt so a new version never caches old numbers
+    bump_widget_version(user_id)
+
+
+def _schedule_aggregate_refresh(user_id):
+    # Run after commit so cascaded deletes of the business itself are not re-created
+    transaction.on_commit(lambda: _refresh_review_summary(user_id))
+
+
+@receiver(post_save, sender=Review)
+def refresh_aggregate_on_review_save(sender, instance, **kwargs):
+    _schedule_aggregate_refresh(instance.user_id)
+
+
+@receiver(post_save, sender=Review)
+def refresh_search_vector_on_review_save(sender, instance, **kwargs):
+    review_id = instance.pk
+    transaction.on_commit(lambda: refresh_search_vectors([review_id]))
+
+
+@receiver(post_save, sender=Order)
+def refresh_search_vectors_on_order_save(sender, instance, created, **kwargs):
+    # A new order has no reviews yet; edits change the order id or customer name its reviews are found by
+    if created:
+        return
+    order_pk = instance.pk
+    transaction.on_commit(
+        lambda: refresh_search_vectors(Review.objects.filter(order_id=order_pk).values_list('id', flat=True))
+    )
+
+
+@receiver(post_delete, sender=Review)
+def refresh_aggregate_on_review_delete(sender, instance, **kwargs):
+    _schedule_aggregate_refresh(instance.user_id)
+
+
+@receiver(post_save, sender=CustomUser)
+def invalidate_widget_on_user_save(sender, instance, **kwargs):
+    transaction.on_commit(lambda: bump_widget_version(instance.pk))
+
+
+@receiver(post_save, sender=BusinessCategory)
+@receiver(post_delete, sender=BusinessCategory)
+def invalidate_widgets_on_category_change(sender, instance, **kwargs):
+    transaction.on_commit(bump_widget_version)
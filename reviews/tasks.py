@@ -1,13 +1,26 @@
 from celery import shared_task
+from django.db import transaction
 from django.utils import timezone
-from .models import Review
+from .models import Review, ReviewAggregate
+from .widget_cache import bump_widget_version
 
 def auto_publish_reviews():
+    """Publish every overdue review with one UPDATE, then refresh each affected business once"""
     now = timezone.now()
-    reviews = Review.objects.filter(is_published=False, auto_publish_at__lte=now)
-    for review in reviews:
-        review.is_published = True
-        review.save()
+    # Served by the partial index review_auto_publish_due_idx
+    due = Review.objects.filter(is_published=False, auto_publish_at__lte=now)
+    with transaction.atomic():
+        user_ids = set(due.values_list('user_id', flat=True).distinct())
+        if not user_ids:
+            return 0
+        # A queryset update skips Review.save(); ratings were settled when the review was submitted
+        published = due.update(is_published=True)
+
+    ReviewAggregate.refresh_for_user_ids(user_ids)
+    for user_id in user_ids:
+        # Bump after the aggregate is rebuilt so a new version never caches old numbers
+        bump_widget_version(user_id)
+    return published
 
 @shared_task
 def periodic_auto_publish_reviews():
@@ -1,3 +1,108 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from orders.models import Order
+
+from .models import Branch, Review, ReviewAggregate
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class OfflineReviewChannelTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='shop', email='shop@example.com', password='secret', plan='pro',
+        )
+
+    def test_branch_save(self):
+        branch = Branch.objects.create(user=self.user, name='Main street')
+        branch.name = 'High street'
+        branch.save()
+        self.assertTrue(branch.token.startswith('br_'))
+
+    def test_submit_offline_review_records_offline_channel(self):
+        branch = Branch.objects.create(user=self.user, name='Main street')
+        response = APIClient().post(
+            reverse('submit_offline_review', args=[branch.token]),
+            {'recommend': 'yes', 'comment': 'Great service'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        review = Review.objects.get(branch=branch)
+        self.assertEqual(review.source, 'offline')
+        self.assertEqual(review.channel, 'offline')
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+class ManualReviewOrderTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='shop', email='shop@example.com', password='secret', plan='pro',
+        )
+        self.order = Order.objects.create(
+            user=self.user, order_id='A-100', customer_name='Real Customer',
+            email='real@example.com', phone_number='123',
+        )
+
+    def test_colliding_order_id_leaves_existing_order_untouched(self):
+        response = self.client.post(
+            reverse('manual_review_form') + f'?company_id={self.user.id}',
+            {'recommend': 'yes', 'comment': 'Great', 'order_id': 'A-100',
+             'customer_name': 'Someone Else', 'email': 'else@example.com'},
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.order.refresh_from_db()
+        self.assertEqual(self.order.customer_name, 'Real Customer')
+        self.assertEqual(self.order.email, 'real@example.com')
+        self.assertFalse(self.order.review_email_sent)
+        self.assertFalse(self.order.reviews.exists())
+
+        review = Review.objects.get(user=self.user)
+        self.assertEqual(review.manual_order_id, 'A-100')
+        self.assertTrue(review.order.order_id.startswith('MAN-'))
+        self.assertEqual(review.order.email, 'else@example.com')
+
+
+class ReviewAggregateTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username='shop', email='shop@example.com', password='secret', plan='pro',
+        )
+
+    def test_refresh_counts_published_reviews(self):
+        Review.objects.create(
+            user=self.user, recommend='yes', comment='Lovely',
+            logistics_rating=5, communication_rating=4, website_usability_rating=3,
+        )
+        Review.objects.create(
+            user=self.user, recommend='no', comment='Slow delivery and nobody answered my emails for a week.',
+            logistics_rating=1, communication_rating=2, website_usability_rating=2,
+        )
+        # Incomplete negative review: not published yet, so not counted
+        Review.objects.create(user=self.user, recommend='no', comment='Bad', logistics_rating=1)
+
+        aggregate = ReviewAggregate.refresh_for_user(self.user)
+
+        self.assertEqual(aggregate.total_count, 2)
+        self.assertEqual(aggregate.positive_count, 1)
+        self.assertEqual(aggregate.positive_percentage, 50)
+        self.assertEqual(aggregate.average('main_rating'), 3.0)
+        self.assertEqual(aggregate.average('logistics_rating'), 3.0)
+        self.assertEqual(aggregate.star_histogram, {5: 0, 4: 1, 3: 0, 2: 1, 1: 0})
+        self.assertEqual(aggregate.latest_comment, 'Slow delivery and nobody answered my emails for a week.')
+
+    def test_delete_refreshes_aggregate(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            kept = Review.objects.create(user=self.user, recommend='yes', comment='Kept', logistics_rating=5)
+            removed = Review.objects.create(user=self.user, recommend='yes', comment='Removed', logistics_rating=2)
+        self.assertEqual(ReviewAggregate.objects.get(user=self.user).total_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            removed.delete()
+
+        aggregate = ReviewAggregate.objects.get(user=self.user)
+        self.assertEqual(aggregate.total_count, 1)
+        self.assertEqual(aggregate.average('main_rating'), kept.main_rating)
+        self.assertEqual(aggregate.latest_comment, 'Kept')
@@ -1,23 +1,44 @@
 # Django view for review form (HTML, not API)
 from django.shortcuts import render, get_object_or_404, redirect
 from .filters import ReviewFilter
-from .models import Review
+from .models import Review, ReviewAggregate
 from orders.models import Order
+from orders.review_tokens import resolve_review_token
 from django.utils import timezone
 from django.contrib import messages
 from users.models import CustomUser, BusinessCategory
+from users.widget_impressions import record_impression
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from utils.utitily import is_trial_active, is_plan_active
 from django.views.decorators.clickjacking import xframe_options_exempt
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from utils.translation_service import (
     get_language_for_country,
     translate_strings,
     translate_sequence,
+    track_fallbacks,
+)
+from .pagination import KEYSET_ORDERING, paginate_keyset
+from .widget_cache import (
+    get_widget_version,
+    widget_cache_key,
+    widget_etag,
+    get_cached_widget,
+    set_cached_widget,
 )
 from uuid import uuid4
+from asgiref.sync import sync_to_async
+import csv
+import json
 
 
 def _build_form_strings(language_code):
@@ -364,7 +385,7 @@ CATEGORY_LABEL_TRANSLATIONS = {
 }
 
 
-def _get_localized_category_questions(business_category, language_code):
+def _get_localized_category_questions(business_category, language_code, wait=False):
     if not business_category:
         return []
 
@@ -392,9 +413,11 @@ def _get_localized_category_questions(business_category, language_code):
 
         if remaining_indices:
             # Use original language_code for translation service (it expects 'cs', not 'cz')
+            # Never block the page: missing labels stay English until the background fill lands
             translated_labels = translate_sequence(
                 [questions[index]["label"] for index in remaining_indices],
                 language_code,
+                wait=wait,
             )
             for index, label in zip(remaining_indices, translated_labels):
                 questions[index]["label"] = label
@@ -411,67 +434,64 @@ def _create_manual_order(company, data):
     email = data.get('email', '').strip() or f"manual-{uuid4().hex[:6]}@example.com"
     phone = data.get('phone_number', '').strip() or 'N/A'
 
-    order = Order.objects.create(
-        user=company,
-        order_id=manual_order_id,
-        customer_name=customer_name,
-        email=email,
-        phone_number=phone,
-        review_email_sent=True,
-    )
+    order_fields = {
+        'user': company,
+        'customer_name': customer_name,
+        'email': email,
+        'phone_number': phone,
+        'review_email_sent': True,
+    }
+    # Submissions never attach to an existing order; a typed id that is taken stays on the review only
+    try:
+        with transaction.atomic():
+            order = Order.objects.create(order_id=manual_order_id, **order_fields)
+    except IntegrityError:
+        order = Order.objects.create(order_id=f"MAN-{uuid4().hex[:8].upper()}", **order_fields)
     return order, manual_order_id, customer_name, email
 
 
 def review_form(request, token):
-    recipient = None
     recipient_country = ""
-    
-    try:
-        order = Order.objects.get(review_token=token)
+
+    # One indexed lookup decides whether the token belongs to an order or a mailing recipient
+    order, recipient = resolve_review_token(token)
+    if order:
         company = order.user
-    except Order.DoesNotExist:
-        try:
-            from orders.models import MailingRecipient
-
-            recipient = MailingRecipient.objects.get(review_token=token)
-            company = recipient.campaign.user
-            order = None
-            # Use recipient's country for language if available, otherwise fall back to company's country
-            recipient_country = getattr(recipient, "country", "") or ""
-        except MailingRecipient.DoesNotExist:
-            recipient = None
-            recipient_country = ""
-            company_id = request.GET.get('company_id')
-            if company_id:
-                try:
-                    company = CustomUser.objects.get(id=company_id)
-                except CustomUser.DoesNotExist:
-                    messages.error(request, 'Company not found.')
-                    return render(
-                        request,
-                        'reviews/review_form.html',
-                        {
-                            'order': None,
-                            'category_questions': [],
-                            'strings': _build_form_strings(None),
-                            'document_lang': 'en',
-                        },
-                    )
-            else:
-                company = CustomUser.objects.filter(plan__in=['basic', 'advanced', 'pro', 'unique']).first()
-                if not company:
-                    messages.error(request, 'No company found for manual review submission.')
-                    return render(
-                        request,
-                        'reviews/review_form.html',
-                        {
-                            'order': None,
-                            'category_questions': [],
-                            'strings': _build_form_strings(None),
-                            'document_lang': 'en',
-                        },
-                    )
-            order = None
+    elif recipient:
+        company = recipient.campaign.user
+        # Use recipient's country for language if available, otherwise fall back to company's country
+        recipient_country = getattr(recipient, "country", "") or ""
+    else:
+        company_id = request.GET.get('company_id')
+        if company_id:
+            try:
+                company = CustomUser.objects.get(id=company_id)
+            except CustomUser.DoesNotExist:
+                messages.error(request, 'Company not found.')
+                return render(
+                    request,
+                    'reviews/review_form.html',
+                    {
+                        'order': None,
+                        'category_questions': [],
+                        'strings': _build_form_strings(None),
+                        'document_lang': 'en',
+                    },
+                )
+        else:
+            company = CustomUser.objects.filter(plan__in=['basic', 'advanced', 'pro', 'unique']).first()
+            if not company:
+                messages.error(request, 'No company found for manual review submission.')
+                return render(
+                    request,
+                    'reviews/review_form.html',
+                    {
+                        'order': None,
+                        'category_questions': [],
+                        'strings': _build_form_strings(None),
+                        'document_lang': 'en',
+                    },
+                )
 
     # Use recipient's country for manual mailing; else use company's (business) country.
     # CZ/SK → Czech/Slovak UI; rest → English.
@@ -543,6 +563,7 @@ def review_form(request, token):
             review_data = {
                 'order': order,
                 'user': company,
+                'channel': 'manual_mailing' if recipient else 'online',
                 'recommend': 'yes',
                 'comment': comment,
                 'logistics_rating': int(logistics_rating) if logistics_rating else None,
@@ -581,6 +602,7 @@ def review_form(request, token):
             review_data = {
                 'order': order,
                 'user': company,
+                'channel': 'manual_mailing' if recipient else 'online',
                 'recommend': 'no',
                 'comment': comment,
                 'logistics_rating': int(logistics_rating) if logistics_rating else None,
@@ -726,6 +748,7 @@ def manual_review_form(request):
             review_data = {
                 'order': order,
                 'user': company,
+                'channel': 'manual_review',
                 'recommend': 'yes',
                 'comment': comment,
                 'logistics_rating': int(logistics_rating) if logistics_rating else None,
@@ -763,6 +786,7 @@ def manual_review_form(request):
             review_data = {
                 'order': order,
                 'user': company,
+                'channel': 'manual_review',
                 'recommend': 'no',
                 'comment': comment,
                 'logistics_rating': int(logistics_rating) if logistics_rating else None,
@@ -788,28 +812,53 @@ def manual_review_form(request):
 
     return render_form()
 
+def _get_widget_language(user):
+    # Language for widget labels (Czech -> cs, Slovak -> sk, etc.)
+    country = getattr(user, "country", "") or ""
+    language_code = get_language_for_country(country) if country else None
+    return language_code or "en"
+
+
 @xframe_options_exempt
 def iframe_(request, user_id):
-    user = get_object_or_404(CustomUser, id=user_id)
-    reviews = Review.objects.filter(user=user, is_published=True)
-    def avg(field):
-        vals = [getattr(r, field) for r in reviews if getattr(r, field) is not None]
-        return round(sum(vals)/len(vals), 2) if vals else None
+    user = get_object_or_404(CustomUser.objects.select_related('business_category'), id=user_id)
 
-    # Increment widget clicks
-    user.widget_clicks += 1
-    user.save()
+    # Buffered impression count; flushed into widget_clicks by a periodic task
+    record_impression(user.pk)
 
-    # Calculate positive review percentage
-    total_reviews = reviews.count()
-    positive_reviews = reviews.filter(recommend='yes').count()
-    positive_percentage = round((positive_reviews / total_reviews * 100), 0) if total_reviews > 0 else 0
+    language_code = _get_widget_language(user)
+    version = get_widget_version(user.pk)
+    etag = widget_etag(user.pk, language_code, user.plan, version)
 
-    # Language for widget labels (Czech -> cs, Slovak -> sk, etc.)
-    country = getattr(user, "country", "") or ""
-    language_code = get_language_for_country(country) if country else None
-    if not language_code:
-        language_code = "en"
+    if etag in parse_etags(request.headers.get('If-None-Match', '')):
+        response = HttpResponseNotModified()
+    else:
+        cache_key = widget_cache_key(user.pk, language_code, user.plan, version)
+        content = get_cached_widget(cache_key)
+        if content is None:
+            with track_fallbacks() as fallbacks:
+                content = _render_iframe_widget(request, user, language_code)
+            if fallbacks:
+                # Rendered with untranslated labels; serve it once without caching or validators
+                response = HttpResponse(content)
+                patch_cache_control(response, no_cache=True)
+                return response
+            set_cached_widget(cache_key, content)
+        response = HttpResponse(content)
+
+    response['ETag'] = etag
+    # Let browsers and proxies keep the widget but revalidate it with If-None-Match
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+def _render_iframe_widget(request, user, language_code):
+    # Precomputed summary of published reviews, so rendering cost does not grow with review volume
+    aggregate = ReviewAggregate.for_user(user)
+    avg = aggregate.average
+
+    # Calculate positive review percentage
+    positive_percentage = aggregate.positive_percentage
 
     # Get category-specific questions for the user's business category
     category_questions = _get_localized_category_questions(
@@ -818,23 +867,16 @@ def iframe_(request, user_id):
     )
     category_ratings_data = []
     if user.business_category:
-        # Calculate average ratings for each category question
+        # Average ratings for each category question
         for question in category_questions:
             field_name = question['field']
-            ratings = []
-            for review in reviews:
-                if review.category_ratings and field_name in review.category_ratings:
-                    rating_value = review.category_ratings[field_name]
-                    if rating_value and rating_value > 0:
-                        ratings.append(rating_value)
-            
-            avg_rating = round(sum(ratings) / len(ratings), 1) if ratings else 0
+            avg_rating, ratings_count = aggregate.category_average(field_name)
             category_ratings_data.append({
                 'label': question['label'],
                 'field': field_name,
                 'avg_rating': avg_rating,
-                'avg_stars': min(5, max(0, int(round(avg_rating)))) if ratings else 0,
-                'count': len(ratings)
+                'avg_stars': min(5, max(0, int(round(avg_rating)))) if ratings_count else 0,
+                'count': ratings_count
             })
     
     # Determine badge level based on positive review percentage
@@ -871,7 +913,6 @@ def iframe_(request, user_id):
         'avg_logistics': avg('logistics_rating'),
         'avg_communication': avg('communication_rating'),
         'avg_website': avg('website_usability_rating'),
-        'reviews': reviews,
         'positive_percentage': int(positive_percentage),
         'category_questions': category_questions,
         'category_ratings_data': category_ratings_data,
@@ -894,7 +935,7 @@ def iframe_(request, user_id):
             'show_company_info': False,
             'show_customization': False,
             'show_expired_message': True,
-            'latest_comment': reviews.last().comment if reviews.exists() else '',
+            'latest_comment': aggregate.latest_comment,
         })
     elif user.plan == 'basic':
         # Only main rating and latest comment
@@ -904,7 +945,7 @@ def iframe_(request, user_id):
             'show_website': False,
             'show_company_info': False,
             'show_customization': False,
-            'latest_comment': reviews.last().comment if reviews.exists() else '',
+            'latest_comment': aggregate.latest_comment,
         })
     elif user.plan == 'advanced':
         # Show all rating fields and more info
@@ -917,7 +958,7 @@ def iframe_(request, user_id):
             'show_website': True,
             'show_company_info': True,
             'show_customization': False,
-            'latest_comment': reviews.last().comment if reviews.exists() else '',
+            'latest_comment': aggregate.latest_comment,
         })
     elif user.plan == 'pro':
         # Show all rating fields, company info, and allow customization/marketing
@@ -930,46 +971,82 @@ def iframe_(request, user_id):
             'show_website': True,
             'show_company_info': True,
             'show_customization': True,
-            'latest_comment': reviews.last().comment if reviews.exists() else '',
+            'latest_comment': aggregate.latest_comment,
             'marketing_banner': user.marketing_banner.url if hasattr(user, 'marketing_banner') and user.marketing_banner else None,
             # Add more customization fields as needed
         })
-    return render(request, 'reviews/iframe_widget.html', context)
+    return render_to_string('reviews/iframe_widget.html', context, request=request)
+
+PUBLIC_REVIEWS_PAGE_SIZE = 20
+
+# Server-side equivalents of the public page filter buttons
+PUBLIC_REVIEW_FILTERS = {
+    'positive': Q(main_rating__gt=2) & ~Q(recommend='no'),
+    'negative': Q(main_rating__lte=2) | Q(recommend='no'),
+}
+
+
+def _build_public_strings(language_code, wait=False):
+    translation_targets = {
+        'page_title_suffix': 'Reviews',
+        'see_more': 'See more',
+        'see_all_reviews_prefix': 'See all',
+        'see_all_reviews_suffix': 'reviews',
+        'all_reviews_title_prefix': 'All Reviews',
+        'filter_all': 'All Reviews',
+        'filter_positive': 'Positive (3+ stars)',
+        'filter_negative': 'Negative (≤2 stars)',
+        'recommend_yes': '✓ Verified',
+        'recommend_no': '✓ Verified',
+        'store_reply': 'Company response:',
+        'review_count_label': 'Reviews:',
+        'footer_text': '© 2025 Level 4 You. All rights reserved.',
+        'logo_alt': 'Level 4 You Logo',
+        'banner_alt': 'Hero Banner',
+        'anonymous_customer': 'Anonymous Customer',
+        'load_more': 'Load more reviews',
+    }
+    public_strings = translate_strings(translation_targets, language_code, wait=wait)
+    public_strings['html_lang'] = language_code or 'en'
+    return public_strings
+
+
+def _filter_public_reviews(reviews, rating_filter):
+    condition = PUBLIC_REVIEW_FILTERS.get(rating_filter)
+    return reviews.filter(condition) if condition is not None else reviews
+
 
 def public_reviews(request, user_id):
-    from django.db.models import Avg, Count, Q
-    from statistics import mean
-    
-    user = get_object_or_404(CustomUser, id=user_id)
-    reviews = Review.objects.filter(user=user, is_published=True).order_by('-created_at')
+    user = get_object_or_404(CustomUser.objects.select_related('business_category'), id=user_id)
+    rating_filter = request.GET.get('rating', 'all')
+    if rating_filter not in PUBLIC_REVIEW_FILTERS:
+        rating_filter = 'all'
+    published = Review.objects.filter(user=user, is_published=True).select_related('order')
+    # Only the first page is rendered; further pages are fetched from public_reviews_page
+    reviews, next_cursor = paginate_keyset(
+        _filter_public_reviews(published, rating_filter),
+        page_size=PUBLIC_REVIEWS_PAGE_SIZE,
+    )
+    # The testimonials show the newest reviews whatever filter the list was opened with
+    testimonials = reviews[:3] if rating_filter == 'all' else list(published.order_by(*KEYSET_ORDERING)[:3])
     
-    # Calculate average rating
-    avg_rating = 0
-    total_reviews = reviews.count()
-    star_distribution = {5: 0, 4: 0, 3: 0, 2: 0, 1: 0}
+    # Average, totals and star distribution come from the precomputed per-business summary
+    aggregate = ReviewAggregate.for_user(user)
+    total_reviews = aggregate.total_count
+    avg_rating = aggregate.average('main_rating', digits=None) or 0
+    star_distribution = aggregate.star_histogram
     star_distribution_list = []
     
-    if total_reviews > 0:
-        ratings = [r.main_rating for r in reviews if r.main_rating is not None]
-        if ratings:
-            avg_rating = sum(ratings) / len(ratings)
-            
-            # Calculate star distribution
-            for review in reviews:
-                if review.main_rating is not None:
-                    rating = int(round(review.main_rating))
-                    if 1 <= rating <= 5:
-                        star_distribution[rating] = star_distribution.get(rating, 0) + 1
-            
-            # Create list for template (5 to 1 stars)
-            for level in [5, 4, 3, 2, 1]:
-                count = star_distribution.get(level, 0)
-                percentage = (count / total_reviews * 100) if total_reviews > 0 else 0
-                star_distribution_list.append({
-                    'level': level,
-                    'count': count,
-                    'percentage': round(percentage, 0)
-                })
+    if total_reviews > 0 and avg_rating:
+        # Create list for template (5 to 1 stars)
+        for level in [5, 4, 3, 2, 1]:
+            count = star_distribution.get(level, 0)
+            percentage = (count / total_reviews * 100) if total_reviews > 0 else 0
+            star_distribution_list.append({
+                'level': level,
+                'count': count,
+                'percentage': round(percentage, 0)
+            })
     
     # Calculate star display (for showing stars like 4.5)
     star_display = []
@@ -987,8 +1064,7 @@ def public_reviews(request, user_id):
         star_display = ['empty', 'empty', 'empty', 'empty', 'empty']
     
     # Calculate positive review percentage
-    positive_reviews = reviews.filter(recommend='yes').count()
-    positive_percentage = round((positive_reviews / total_reviews * 100), 0) if total_reviews > 0 else 0
+    positive_percentage = aggregate.positive_percentage
     
     # Determine badge level based on positive review percentage
     # 98%+ → Gold, 95%+ → Silver, 90%+ → Bronze
@@ -1019,30 +1095,12 @@ def public_reviews(request, user_id):
         "Recenze na této stránce jsou shromažďovány prostřednictvím systému LEVEL, nezávislé platformy pro sběr a ověřování zpětné vazby od lidí, kteří skutečně studovali na školách EDUCAnet nebo s nimi byli v kontaktu. Systém zveřejňuje pouze ověřené recenze, aby budoucím studentům, rodičům i partnerům pomohl lépe porozumět reálným zkušenostem, kvalitě vzdělávání a životu na škole před tím, než učiní své rozhodnutí.",
     ]
 
-    translation_targets = {
-        'page_title_suffix': 'Reviews',
-        'see_more': 'See more',
-        'see_all_reviews_prefix': 'See all',
-        'see_all_reviews_suffix': 'reviews',
-        'all_reviews_title_prefix': 'All Reviews',
-        'filter_all': 'All Reviews',
-        'filter_positive': 'Positive (3+ stars)',
-        'filter_negative': 'Negative (≤2 stars)',
-        'recommend_yes': '✓ Verified',
-        'recommend_no': '✓ Verified',
-        'store_reply': 'Company response:',
-        'review_count_label': 'Reviews:',
-        'footer_text': '© 2025 Level 4 You. All rights reserved.',
-        'logo_alt': 'Level 4 You Logo',
-        'banner_alt': 'Hero Banner',
-        'anonymous_customer': 'Anonymous Customer',
-    }
-    public_strings = translate_strings(translation_targets, language_code)
-    public_strings['html_lang'] = language_code or 'en'
+    public_strings = _build_public_strings(language_code)
 
     context = {
         'user': user,
         'reviews': reviews,
+        'testimonials': testimonials,
         'avg_rating': round(avg_rating, 1),
         'total_reviews': total_reviews,
         'star_distribution': star_distribution,
@@ -1053,54 +1111,68 @@ def public_reviews(request, user_id):
         'category_questions': category_questions,
         'public_strings': public_strings,
         'description_paragraphs': description_paragraphs,
+        'next_cursor': next_cursor,
+        'rating_filter': rating_filter,
     }
     
     return render(request, 'reviews/public_reviews.html', context)
 
+
+def public_reviews_page(request, user_id):
+    """JSON endpoint returning the next page of public review cards (infinite scroll)"""
+    user = get_object_or_404(CustomUser.objects.select_related('business_category'), id=user_id)
+    rating_filter = request.GET.get('rating', 'all')
+    published = Review.objects.filter(user=user, is_published=True).select_related('order')
+    try:
+        reviews, next_cursor = paginate_keyset(
+            _filter_public_reviews(published, rating_filter),
+            cursor=request.GET.get('cursor'),
+            page_size=PUBLIC_REVIEWS_PAGE_SIZE,
+        )
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor.'}, status=400)
+
+    language_code = get_language_for_country(getattr(user, "country", None))
+    html = render_to_string('reviews/partials/public_review_cards.html', {
+        'reviews': reviews,
+        'category_questions': _get_localized_category_questions(
+            getattr(user, "business_category", None),
+            language_code,
+        ),
+        'public_strings': _build_public_strings(language_code),
+    }, request=request)
+    return JsonResponse({
+        'html': html,
+        'count': len(reviews),
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
+    })
+
+def _dashboard_category_meta(user):
+    """Return (business_category, category_questions) describing the user's category schema"""
+    if not user.business_category:
+        return None, []
+    business_category = {
+        'name': user.business_category.name,
+        'display_name': user.business_category.display_name,
+        'icon': user.business_category.icon
+    }
+    return business_category, BusinessCategory.get_default_questions().get(user.business_category.name, [])
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_reviews_api(request):
     user = request.user
     # Return all reviews for the logged-in user (dashboard/statistics); filter can restrict by is_published via GET
-    reviews = Review.objects.filter(user=user).order_by('-created_at')
-    reviews = ReviewFilter(request.GET, queryset=reviews).qs
+    reviews = Review.objects.filter(user=user).select_related('order', 'branch').order_by('-created_at')
+    reviews = ReviewFilter(request.GET, queryset=reviews, request=request).qs
+
+    # Business category information is the same for every review of this user
+    business_category, category_questions = _dashboard_category_meta(user)
+
     data = []
     for review in reviews:
-        # Get business category information
-        business_category = None
-        category_questions = []
-        if review.user.business_category:
-            business_category = {
-                'name': review.user.business_category.name,
-                'display_name': review.user.business_category.display_name,
-                'icon': review.user.business_category.icon
-            }
-            category_questions = BusinessCategory.get_default_questions().get(review.user.business_category.name, [])
-        
-        # Determine review source type
-        review_source_type = 'Online'  # default
-        if review.source == 'offline':
-            review_source_type = 'Offline (QR)'
-            branch_name = review.branch.name if review.branch else None
-        elif review.order:
-            # Check if order came from manual mailing campaign
-            from orders.models import MailingRecipient
-            customer_email = review.order.email if review.order else None
-            if customer_email:
-                # Check if there's a MailingRecipient with this email that has been reviewed
-                mailing_recipient = MailingRecipient.objects.filter(
-                    campaign__user=user,
-                    email=customer_email,
-                    status='reviewed'
-                ).first()
-                if mailing_recipient:
-                    review_source_type = 'Manual Mailing'
-        elif not review.order and (review.manual_order_id or review.manual_customer_name):
-            # Manual review form (no order, but has manual fields)
-            review_source_type = 'Manual Review'
-        else:
-            review_source_type = 'Online'
-        
         data.append({
             'id': review.id,
             'order_id': review.order.order_id if review.order else (review.manual_order_id if review.manual_order_id else None),
@@ -1122,11 +1194,192 @@ def user_reviews_api(request):
             'red_flagged': review.is_flagged_red,
             'auto_publish_at': review.auto_publish_at,
             'source': review.source,  # 'online' or 'offline'
-            'source_type': review_source_type,  # 'Online', 'Manual Mailing', 'Offline (QR)', 'Manual Review'
+            'source_type': review.get_channel_display(),  # 'Online', 'Manual Mailing', 'Offline (QR)', 'Manual Review'
+            'channel': review.channel,
             'branch_name': review.branch.name if review.branch else None,
         })
     return Response({'reviews': data}, status=status.HTTP_200_OK)
 
+# v2 dashboard API: output field -> model columns it is built from
+DASHBOARD_REVIEW_FIELDS = {
+    'id': ('id',),
+    'order_id': ('order', 'order__order_id', 'manual_order_id'),
+    'customer_name': ('order', 'order__customer_name', 'manual_customer_name'),
+    'customer_email': ('order', 'order__email', 'manual_customer_email'),
+    'customer_address': ('manual_customer_address',),
+    'main_rating': ('main_rating',),
+    'logistics_rating': ('logistics_rating',),
+    'communication_rating': ('communication_rating',),
+    'website_usability_rating': ('website_usability_rating',),
+    'category_ratings': ('category_ratings',),
+    'recommend': ('recommend',),
+    'comment': ('comment',),
+    'reply': ('reply',),
+    'is_published': ('is_published',),
+    'created_at': ('created_at',),
+    'red_flagged': ('is_flagged_red',),
+    'auto_publish_at': ('auto_publish_at',),
+    'source': ('source',),
+    'source_type': ('channel',),
+    'channel': ('channel',),
+    'branch_name': ('branch__name',),
+}
+DASHBOARD_PAGE_SIZE = 50
+DASHBOARD_MAX_PAGE_SIZE = 200
+
+
+REVIEW_CHANNEL_LABELS = dict(Review.CHANNEL_CHOICES)
+
+
+def _dashboard_review_row(row, fields):
+    has_order = row.get('order') is not None
+    builders = {
+        'order_id': lambda: row['order__order_id'] if has_order else (row['manual_order_id'] or None),
+        'customer_name': lambda: row['order__customer_name'] if has_order else (row['manual_customer_name'] or 'Anonymous Customer'),
+        'customer_email': lambda: row['order__email'] if has_order else (row['manual_customer_email'] or None),
+        'customer_address': lambda: row['manual_customer_address'] or None,
+        'red_flagged': lambda: row['is_flagged_red'],
+        'branch_name': lambda: row['branch__name'],
+        'source_type': lambda: REVIEW_CHANNEL_LABELS.get(row['channel'], row['channel']),
+    }
+    return {field: builders[field]() if field in builders else row[field] for field in fields}
+
+
+def _requested_dashboard_fields(request):
+    """Return (fields, unknown) from the `fields` parameter; all fields when it is absent"""
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(DASHBOARD_REVIEW_FIELDS), []
+    fields = [field.strip() for field in requested.split(',') if field.strip()]
+    return fields, [field for field in fields if field not in DASHBOARD_REVIEW_FIELDS]
+
+
+def _unknown_fields_response(unknown):
+    return Response(
+        {'error': f"Unknown fields: {', '.join(unknown)}", 'allowed_fields': list(DASHBOARD_REVIEW_FIELDS)},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def _dashboard_columns(fields):
+    # id and created_at are always loaded for the cursor
+    columns = {'id', 'created_at'}
+    for field in fields:
+        columns.update(DASHBOARD_REVIEW_FIELDS[field])
+    return sorted(columns)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_reviews_api_v2(request):
+    """
+    Cursor-paginated dashboard reviews. `fields` limits the columns that are loaded and returned;
+    the category schema is sent once in `meta` instead of on every review.
+    Pages are always newest first: `search` narrows the results but its rank and `sort_by`
+    do not reorder them, since the cursor is keyed on (created_at, id).
+    """
+    user = request.user
+    fields, unknown = _requested_dashboard_fields(request)
+    if unknown:
+        return _unknown_fields_response(unknown)
+
+    try:
+        page_size = min(int(request.GET.get('page_size', DASHBOARD_PAGE_SIZE)), DASHBOARD_MAX_PAGE_SIZE)
+    except ValueError:
+        page_size = DASHBOARD_PAGE_SIZE
+    page_size = max(1, page_size)
+
+    reviews = ReviewFilter(request.GET, queryset=Review.objects.filter(user=user), request=request).qs
+    try:
+        rows, next_cursor = paginate_keyset(
+            reviews.values(*_dashboard_columns(fields)),
+            cursor=request.GET.get('cursor'),
+            page_size=page_size,
+        )
+    except ValueError:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    business_category, category_questions = _dashboard_category_meta(user)
+    return Response({
+        'reviews': [_dashboard_review_row(row, fields) for row in rows],
+        'next_cursor': next_cursor,
+        'has_more': next_cursor is not None,
+        'meta': {
+            'business_category': business_category,
+            'category_questions': category_questions,
+        },
+    }, status=status.HTTP_200_OK)
+
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+class _Echo:
+    """File-like object whose write() returns the value, so csv.writer yields lines"""
+
+    def write(self, value):
+        return value
+
+
+def _export_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+async def _export_chunks(reviews, fields):
+    """
+    Yield lists of export rows, one keyset page at a time. Each page is fetched in a worker
+    thread, so under ASGI the response is sent as it is produced instead of being buffered.
+    """
+    fetch_page = sync_to_async(paginate_keyset)
+    cursor = None
+    while True:
+        rows, cursor = await fetch_page(reviews, cursor=cursor, page_size=EXPORT_CHUNK_SIZE)
+        yield [_dashboard_review_row(row, fields) for row in rows]
+        if cursor is None:
+            return
+
+
+async def _stream_csv(chunks, fields):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    async for rows in chunks:
+        yield ''.join(writer.writerow([_export_value(row[field]) for field in fields]) for row in rows)
+
+
+async def _stream_ndjson(chunks):
+    async for rows in chunks:
+        yield ''.join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in rows)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_reviews_api(request, export_format):
+    """
+    Stream every review matching the ReviewFilter parameters as CSV or NDJSON, newest first.
+    Rows are read in keyset pages of EXPORT_CHUNK_SIZE, so memory use does not grow with the export size.
+    """
+    if export_format not in ('csv', 'ndjson'):
+        return Response({'error': 'Format must be csv or ndjson.'}, status=status.HTTP_400_BAD_REQUEST)
+    fields, unknown = _requested_dashboard_fields(request)
+    if unknown:
+        return _unknown_fields_response(unknown)
+
+    reviews = ReviewFilter(request.GET, queryset=Review.objects.filter(user=request.user), request=request).qs
+    chunks = _export_chunks(reviews.values(*_dashboard_columns(fields)), fields)
+
+    if export_format == 'csv':
+        response = StreamingHttpResponse(_stream_csv(chunks, fields), content_type='text/csv; charset=utf-8')
+    else:
+        response = StreamingHttpResponse(_stream_ndjson(chunks), content_type='application/x-ndjson')
+    filename = f"reviews-{timezone.now():%Y%m%d}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def reply_to_negative_review(request, review_id):
@@ -0,0 +1,65 @@
+"""
+Whole-response cache for the embeddable iframe widget.
+
+Rendered widgets are cached per business, language and plan. Every key
+embeds a version stamp (global + per business) that is replaced with a new
+random token whenever a Review, CustomUser or BusinessCategory row changes,
+so stale entries are never read and simply expire.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+GLOBAL_VERSION_KEY = 'widget:version:global'
+USER_VERSION_KEY = 'widget:version:user:{user_id}'
+
+
+def _new_version():
+    # Random rather than a counter: a token recreated after eviction, a Redis restart or a
+    # restore never repeats an earlier value, so an old ETag cannot match new content
+    return uuid.uuid4().hex[:16]
+
+
+def _get_version(key):
+    value = cache.get(key)
+    if value is None:
+        cache.add(key, _new_version(), timeout=None)
+        # Still None when the cache is unavailable; a one-off token disables revalidation
+        value = cache.get(key) or _new_version()
+    return value
+
+
+def _bump_version(key):
+    cache.set(key, _new_version(), timeout=None)
+
+
+def get_widget_version(user_id):
+    """Current version stamp for a business's widget"""
+    return f"{_get_version(GLOBAL_VERSION_KEY)}.{_get_version(USER_VERSION_KEY.format(user_id=user_id))}"
+
+
+def bump_widget_version(user_id=None):
+    """Invalidate cached widgets for one business, or for all businesses when user_id is None"""
+    if user_id is None:
+        _bump_version(GLOBAL_VERSION_KEY)
+    else:
+        _bump_version(USER_VERSION_KEY.format(user_id=user_id))
+
+
+def widget_cache_key(user_id, language_code, plan, version):
+    return f"widget:html:{user_id}:{language_code}:{plan}:{version}"
+
+
+def widget_etag(user_id, language_code, plan, version):
+    digest = hashlib.md5(f"{user_id}:{language_code}:{plan}:{version}".encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def get_cached_widget(key):
+    return cache.get(key)
+
+
+def set_cached_widget(key, content):
+    cache.set(key, content, timeout=getattr(settings, 'WIDGET_CACHE_TIMEOUT', 60 * 60 * 24))
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import CustomUser, BusinessCategory, MonthlyRating
+from .models import CustomUser, BusinessCategory, MonthlyRating, WidgetImpression
 
 
 @admin.register(CustomUser)
@@ -41,3 +41,10 @@ class MonthlyRatingAdmin(admin.ModelAdmin):
     list_display = ['user', 'year', 'month', 'average_rating']
     list_filter = ['year', 'month']
     search_fields = ['user__username', 'user__email']
+
+
+@admin.register(WidgetImpression)
+class WidgetImpressionAdmin(admin.ModelAdmin):
+    list_display = ['user', 'hour', 'count']
+    list_filter = ['hour']
+    search_fields = ['user__username', 'user__email']
@@ -12,8 +12,8 @@ logger = logging.getLogger(__name__)
 
 # Try to use SendGrid SDK if available, fallback to SMTP
 try:
-    import sendgrid
     from sendgrid.helpers.mail import Mail, Email, To, Content
+    from orders.mail_batch import SendGridTransport
     SENDGRID_AVAILABLE = True
 except ImportError:
     SENDGRID_AVAILABLE = False
@@ -58,7 +58,7 @@ def send_welcome_email(user):
         
         # Use SendGrid SDK if available
         if SENDGRID_AVAILABLE and os.environ.get('SENDGRID_API_KEY'):
-            sg = sendgrid.SendGridAPIClient(api_key=os.environ.get('SENDGRID_API_KEY'))
+            transport = SendGridTransport(api_key=os.environ.get('SENDGRID_API_KEY'))
             
             from_email = Email(settings.DEFAULT_FROM_EMAIL)
             to_email = To(user.email)
@@ -68,7 +68,7 @@ def send_welcome_email(user):
             mail = Mail(from_email, to_email, subject, content)
             mail.add_content(Content("text/plain", text_message))
             
-            response = sg.send(mail)
+            response = transport.send(mail)
             logger.info(f"Welcome email sent to {user.email} via SendGrid. Status: {response.status_code}")
         else:
             # Fallback to Django's send_mail
@@ -135,7 +135,7 @@ def send_password_reset_email(user, request):
         
         # Use SendGrid SDK if available
         if SENDGRID_AVAILABLE and os.environ.get('SENDGRID_API_KEY'):
-            sg = sendgrid.SendGridAPIClient(api_key=os.environ.get('SENDGRID_API_KEY'))
+            transport = SendGridTransport(api_key=os.environ.get('SENDGRID_API_KEY'))
             
             from_email = Email(settings.DEFAULT_FROM_EMAIL)
             to_email = To(user.email)
@@ -145,7 +145,7 @@ def send_password_reset_email(user, request):
             mail = Mail(from_email, to_email, subject, content)
             mail.add_content(Content("text/plain", text_message))
             
-            response = sg.send(mail)
+            response = transport.send(mail)
             logger.info(f"Password reset email sent to {user.email} via SendGrid. Status: {response.status_code}")
         else:
             # Fallback to Django's send_mail
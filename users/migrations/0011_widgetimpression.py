@@ -0,0 +1,28 @@
+# Generated by Django 5.2.4 on 2026-10-17 18:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_customuser_business_logo'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WidgetImpression',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='widget_impressions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-hour'],
+                'unique_together': {('user', 'hour')},
+            },
+        ),
+    ]
@@ -201,4 +201,14 @@ class MonthlyRating(models.Model):
     average_rating = models.FloatField()
 
     class Meta:
-        unique_together = ('user', 'year', 'month')
\ No newline at end of file
+        unique_together = ('user', 'year', 'month')
+
+class WidgetImpression(models.Model):
+    """Hourly bucket of iframe widget impressions, flushed from the Redis buffer"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='widget_impressions')
+    hour = models.DateTimeField()  # Start of the hourly bucket (UTC)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('user', 'hour')
+        ordering = ['-hour']
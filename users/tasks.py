@@ -0,0 +1,8 @@
+from celery import shared_task
+from .widget_impressions import flush_impressions
+
+
+@shared_task
+def flush_widget_impressions():
+    flushed = flush_impressions()
+    return f"Flushed {flushed} widget impressions"
@@ -4,13 +4,17 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from .serializers import UserSignupSerializer, UserProfileSerializer
-from .models import CustomUser, BusinessCategory
+from .models import CustomUser, BusinessCategory, WidgetImpression
 from utils.utitily import is_plan_active, is_trial_active
 from .email_utils import send_welcome_email, send_password_reset_email
 from django.contrib.auth.tokens import default_token_generator
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from datetime import timedelta
 import logging
 
 logger = logging.getLogger(__name__)
@@ -76,12 +80,36 @@ def user_statistics_api(request):
     published_reviews = user.reviews.filter(is_published=True).count()
     unpublished_reviews = user.reviews.filter(is_published=False).count()
     clicks = getattr(user, 'widget_clicks', 0)
+
+    # Widget impression trends from the hourly buckets
+    now = timezone.now()
+    hourly_impressions = [
+        {'hour': bucket.hour.isoformat(), 'count': bucket.count}
+        for bucket in WidgetImpression.objects.filter(user=user, hour__gte=now - timedelta(hours=24)).order_by('hour')
+    ]
+    daily_impressions = [
+        {'date': row['day'].isoformat(), 'count': row['count']}
+        for row in WidgetImpression.objects.filter(user=user, hour__gte=now - timedelta(days=30))
+        .annotate(day=TruncDate('hour'))
+        .values('day')
+        .annotate(count=Sum('count'))
+        .order_by('day')
+    ]
+
+    # Review counts per collection channel, grouped in SQL
+    reviews_by_channel = {
+        row['channel']: row['count']
+        for row in user.reviews.values('channel').annotate(count=Count('id')).order_by()
+    }
     
     return Response({
         'total_reviews': total_reviews,
         'published_reviews': published_reviews,
         'unpublished_reviews': unpublished_reviews,
         'widget_clicks': clicks,
+        'widget_impressions_hourly': hourly_impressions,
+        'widget_impressions_daily': daily_impressions,
+        'reviews_by_channel': reviews_by_channel,
     })
 
 @api_view(['GET'])
@@ -0,0 +1,113 @@
+"""
+Buffered widget impression counting.
+
+The iframe widget is the hottest public endpoint, so impressions are not
+written to CustomUser on every view. Each hit is an HINCRBY on a Redis
+hash per hourly bucket; the periodic ``flush_widget_impressions`` task
+moves the buffered counts into ``CustomUser.widget_clicks`` (via F()
+expressions) and into ``WidgetImpression`` hourly buckets.
+If Redis is not available the hit is written to the database directly.
+"""
+import datetime
+import logging
+import uuid
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import CustomUser, WidgetImpression
+
+logger = logging.getLogger(__name__)
+
+PENDING_BUCKETS_KEY = 'widget:impressions:pending'
+BUCKET_KEY_PREFIX = 'widget:impressions:'
+BUCKET_FORMAT = '%Y%m%d%H'
+
+
+def _get_connection():
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def _bucket_start(moment=None):
+    moment = moment or timezone.now()
+    return moment.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_key(bucket_start):
+    return f"{BUCKET_KEY_PREFIX}{bucket_start.strftime(BUCKET_FORMAT)}"
+
+
+def _parse_bucket_key(key):
+    stamp = key[len(BUCKET_KEY_PREFIX):]
+    return datetime.datetime.strptime(stamp, BUCKET_FORMAT).replace(tzinfo=datetime.timezone.utc)
+
+
+def apply_impressions(bucket_start, counts):
+    """Add {user_id: count} impressions for one hourly bucket to the database"""
+    existing_ids = set(
+        CustomUser.objects.filter(id__in=list(counts)).values_list('id', flat=True)
+    )
+    with transaction.atomic():
+        for user_id, count in counts.items():
+            if user_id not in existing_ids or count <= 0:
+                continue
+            CustomUser.objects.filter(pk=user_id).update(widget_clicks=F('widget_clicks') + count)
+            # get_or_create absorbs a concurrent insert of the same bucket instead of failing on it
+            impression, created = WidgetImpression.objects.get_or_create(
+                user_id=user_id, hour=bucket_start, defaults={'count': count}
+            )
+            if not created:
+                WidgetImpression.objects.filter(pk=impression.pk).update(count=F('count') + count)
+
+
+def record_impression(user_id):
+    """Count one widget impression for a business"""
+    bucket_start = _bucket_start()
+    try:
+        connection = _get_connection()
+        key = _bucket_key(bucket_start)
+        pipeline = connection.pipeline()
+        pipeline.hincrby(key, str(user_id), 1)
+        pipeline.sadd(PENDING_BUCKETS_KEY, key)
+        pipeline.execute()
+    except Exception as e:
+        logger.warning(f"Widget impression buffer unavailable, writing directly: {e}")
+        apply_impressions(bucket_start, {user_id: 1})
+
+
+def flush_impressions():
+    """Move buffered impressions from Redis into the database. Returns the number flushed."""
+    connection = _get_connection()
+    flushed = 0
+    for raw_key in connection.smembers(PENDING_BUCKETS_KEY):
+        key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+        processing_key = f"{key}:flushing"
+        # The key stays in the pending set until its counts are written, so a crash at any
+        # point leaves the bucket (live or processing) to be picked up by the next flush
+        if not connection.exists(processing_key):
+            try:
+                connection.rename(key, processing_key)
+            except Exception:
+                # Bucket already flushed or never written
+                connection.srem(PENDING_BUCKETS_KEY, key)
+                continue
+
+        counts = {}
+        for user_id, count in connection.hgetall(processing_key).items():
+            user_id = user_id.decode() if isinstance(user_id, bytes) else user_id
+            try:
+                counts[uuid.UUID(user_id)] = int(count)
+            except (TypeError, ValueError):
+                continue
+
+        # On failure the processing hash and pending entry stay in place for the next flush
+        apply_impressions(_parse_bucket_key(key), counts)
+        connection.delete(processing_key)
+        connection.srem(PENDING_BUCKETS_KEY, key)
+        if connection.exists(key):
+            # Hits that arrived after the rename still need a pass
+            connection.sadd(PENDING_BUCKETS_KEY, key)
+        flushed += sum(counts.values())
+    return flushed
@@ -0,0 +1,173 @@
+"""
+Shared outbound HTTP client.
+
+Every call to an external API (SendGrid, Google Translate) goes through one
+requests.Session per process, so TCP/TLS connections are kept alive and
+reused instead of being opened for every email or translation. Each host
+gets its own connection pool, sized by HTTP_CLIENT_POOL_SIZES.
+
+Connection failures are retried with jittered exponential backoff. Error
+responses are retried only when the request cannot have taken effect:
+idempotent methods on 429/502/503/504, and POSTs (an email send carries up
+to 1000 recipients) only on 429/503 that carry Retry-After. Reads are never
+retried.
+
+Request latency, retries included, is recorded per host in a fixed-bucket
+histogram; see http_client_stats(). Each process logs its histogram to the
+utils.http_client logger every HTTP_CLIENT_STATS_LOG_INTERVAL seconds.
+"""
+from __future__ import annotations
+
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10
+DEFAULT_STATS_LOG_INTERVAL = 300
+
+# Upper bounds in milliseconds; the last bucket collects everything slower
+LATENCY_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+RETRY_STATUSES = (429, 502, 503, 504)
+# A gateway error on a POST may follow an accepted request; only explicit refusals are retried
+POST_RETRY_STATUSES = (429, 503)
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+_stats: Dict[str, dict] = {}
+_stats_lock = threading.Lock()
+_stats_logged_at = time.monotonic()
+
+
+class OutboundRetry(Retry):
+    """Retry policy that never replays a non-idempotent request the server may have processed"""
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if not self._is_method_retryable(method):
+            return bool(self.total and has_retry_after and status_code in POST_RETRY_STATUSES)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+def _retry():
+    return OutboundRetry(
+        total=getattr(settings, 'HTTP_CLIENT_RETRIES', 3),
+        read=0,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+        backoff_factor=getattr(settings, 'HTTP_CLIENT_BACKOFF', 0.2),
+        backoff_jitter=getattr(settings, 'HTTP_CLIENT_BACKOFF_JITTER', 0.2),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _build_session():
+    session = requests.Session()
+    default_adapter = HTTPAdapter(pool_maxsize=DEFAULT_POOL_SIZE, max_retries=_retry())
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+    # Longest prefix wins, so these take precedence over the defaults
+    for host, pool_size in getattr(settings, 'HTTP_CLIENT_POOL_SIZES', {}).items():
+        session.mount(f'https://{host}/', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=_retry()))
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session; a forked worker builds its own instead of sharing sockets"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                _session = _build_session()
+                _session_pid = pid
+    return _session
+
+
+def _record(host: str, elapsed_ms: float, failed: bool) -> None:
+    global _stats_logged_at
+    interval = getattr(settings, 'HTTP_CLIENT_STATS_LOG_INTERVAL', DEFAULT_STATS_LOG_INTERVAL)
+    with _stats_lock:
+        host_stats = _stats.get(host)
+        if host_stats is None:
+            host_stats = _stats[host] = {
+                'count': 0,
+                'errors': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+            }
+        host_stats['count'] += 1
+        host_stats['errors'] += int(failed)
+        host_stats['total_ms'] += elapsed_ms
+        host_stats['max_ms'] = max(host_stats['max_ms'], elapsed_ms)
+        host_stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+        now = time.monotonic()
+        log_due = bool(interval) and now - _stats_logged_at >= interval
+        if log_due:
+            _stats_logged_at = now
+    if log_due:
+        log_http_client_stats()
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send a request through the shared session and record its latency"""
+    kwargs.setdefault('timeout', getattr(settings, 'HTTP_CLIENT_TIMEOUT', DEFAULT_TIMEOUT))
+    host = urlsplit(url).hostname or ''
+    started = time.monotonic()
+    failed = True
+    try:
+        response = get_session().request(method, url, **kwargs)
+        failed = response.status_code >= 400
+        return response
+    finally:
+        _record(host, (time.monotonic() - started) * 1000, failed)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return request('POST', url, **kwargs)
+
+
+def http_client_stats() -> Dict[str, dict]:
+    """Per-host request counts, errors and latency histogram for this process"""
+    labels = [f'<={bound}ms' for bound in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]}ms']
+    with _stats_lock:
+        return {
+            host: {
+                'count': host_stats['count'],
+                'errors': host_stats['errors'],
+                'avg_ms': round(host_stats['total_ms'] / host_stats['count'], 1),
+                'max_ms': round(host_stats['max_ms'], 1),
+                'histogram': dict(zip(labels, host_stats['buckets'])),
+            }
+            for host, host_stats in _stats.items()
+        }
+
+
+def log_http_client_stats() -> None:
+    """Log this process's per-host request counts and latency histogram"""
+    for host, host_stats in http_client_stats().items():
+        logger.info(
+            "Outbound HTTP %s (pid %s): %s requests, %s errors, avg %sms, max %sms, histogram %s",
+            host, os.getpid(), host_stats['count'], host_stats['errors'],
+            host_stats['avg_ms'], host_stats['max_ms'], host_stats['histogram'],
+        )
+
+
+def reset_http_client_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
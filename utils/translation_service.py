@@ -1,16 +1,27 @@
 from __future__ import annotations
 
+import hashlib
 import html
 import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from functools import lru_cache
-from typing import Dict, Iterable, List, Mapping, Sequence, Tuple, Union
+from typing import Dict, Iterable, List, Mapping, Sequence, Union
 
-import requests
 from django.conf import settings
+from django.core.cache import cache
+
+from utils import http_client
 
 LanguageCode = str
 Translations = Dict[str, str]
 
+SOURCE_LANGUAGE: LanguageCode = "en"
+
 COUNTRY_LANGUAGE_MAP: Dict[str, LanguageCode] = {
     "czech": "cs",
     "czech republic": "cs",
@@ -32,14 +43,42 @@ def _normalize_country(value: Union[str, None]) -> str:
     return value.strip().lower()
 
 
+def _compile_country_pattern(keys: Iterable[str]) -> "re.Pattern[str]":
+    # Longest keys first so "czech republic" wins over "cz" at the same position
+    alternatives = sorted(keys, key=len, reverse=True)
+    return re.compile("|".join(re.escape(key) for key in alternatives))
+
+
+_COUNTRY_PATTERN = _compile_country_pattern(COUNTRY_LANGUAGE_MAP)
+_COUNTRY_PRIORITY = {key: index for index, key in enumerate(COUNTRY_LANGUAGE_MAP)}
+
+
+@lru_cache(maxsize=1024)
+def _resolve_country(normalized: str) -> Union[LanguageCode, None]:
+    code = COUNTRY_LANGUAGE_MAP.get(normalized)
+    if code:
+        return code
+    # One scan of the input; when several keys occur, the earliest map entry wins as before
+    matches = [match.group(0) for match in _COUNTRY_PATTERN.finditer(normalized)]
+    if not matches:
+        return None
+    return COUNTRY_LANGUAGE_MAP[min(matches, key=_COUNTRY_PRIORITY.__getitem__)]
+
+
+def register_country_languages(mapping: Mapping[str, LanguageCode]) -> None:
+    """Add country names or codes (matched case-insensitively) and rebuild the resolver."""
+    global _COUNTRY_PATTERN, _COUNTRY_PRIORITY
+    COUNTRY_LANGUAGE_MAP.update({_normalize_country(key): code for key, code in mapping.items()})
+    _COUNTRY_PATTERN = _compile_country_pattern(COUNTRY_LANGUAGE_MAP)
+    _COUNTRY_PRIORITY = {key: index for index, key in enumerate(COUNTRY_LANGUAGE_MAP)}
+    _resolve_country.cache_clear()
+
+
 def get_language_for_country(country: Union[str, None]) -> Union[LanguageCode, None]:
     normalized = _normalize_country(country)
     if not normalized:
         return None
-    for key, code in COUNTRY_LANGUAGE_MAP.items():
-        if key in normalized:
-            return code
-    return None
+    return _resolve_country(normalized)
 
 
 def _get_api_key() -> Union[str, None]:
@@ -50,56 +89,363 @@ def _get_api_key() -> Union[str, None]:
     )
 
 
-def _translate_list(values: Sequence[str], target_language: LanguageCode) -> List[str]:
-    if not values:
-        return list(values)
-
+def _translate_list(
+    values: Sequence[str], target_language: LanguageCode, text_format: str = "text"
+) -> Union[List[str], None]:
+    """Call Google Translate; returns None when the call fails so nothing gets cached."""
     api_key = _get_api_key()
     if not api_key:
-        return list(values)
+        return None
 
     endpoint = "https://translation.googleapis.com/language/translate/v2"
     payload = {
         "q": list(values),
         "target": target_language,
-        "format": "text",
-        "source": "en",
+        "format": text_format,
+        "source": SOURCE_LANGUAGE,
         "key": api_key,
     }
 
     try:
-        response = requests.post(endpoint, data=payload, timeout=6)
+        response = http_client.post(endpoint, data=payload, timeout=6)
         response.raise_for_status()
         data = response.json()
         translations = data.get("data", {}).get("translations", [])
         if len(translations) != len(values):
-            return list(values)
+            return None
         return [html.unescape(item.get("translatedText", original)) for item, original in zip(translations, values)]
     except Exception:
-        return list(values)
+        return None
+
+
+# Two-tier cache: a per-process LRU in front of the shared Django cache (Redis).
+# Shared entries never expire; a translation of a given text does not change.
+_local_cache: "OrderedDict[str, str]" = OrderedDict()
+_local_cache_lock = threading.Lock()
+_process_stats: Counter = Counter()
+# Counted since the last push to the shared counters
+_unflushed_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+_stats_flushed_at = time.monotonic()
+
+STATS_COUNTERS = ("local_hits", "shared_hits", "misses", "api_failures")
+
+
+def _cache_key(text: str, target_language: LanguageCode, text_format: str) -> str:
+    raw = "\x1f".join((SOURCE_LANGUAGE, target_language, text_format, text))
+    return "translation:" + hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _failure_key(key: str) -> str:
+    # Set for a short while after a failed call, so an outage is not retried on every lookup
+    return key + ":failed"
+
+
+def _local_get(key: str) -> Union[str, None]:
+    with _local_cache_lock:
+        value = _local_cache.get(key)
+        if value is not None:
+            _local_cache.move_to_end(key)
+        return value
+
+
+def _local_set(key: str, value: str) -> None:
+    max_size = getattr(settings, "TRANSLATION_LOCAL_CACHE_SIZE", 2048)
+    with _local_cache_lock:
+        _local_cache[key] = value
+        _local_cache.move_to_end(key)
+        while len(_local_cache) > max_size:
+            _local_cache.popitem(last=False)
+
+
+def _flush_stats() -> None:
+    """Add the counts gathered since the last flush to the shared counters."""
+    global _stats_flushed_at
+    with _stats_lock:
+        counts = +_unflushed_stats
+        _unflushed_stats.clear()
+        _stats_flushed_at = time.monotonic()
+    try:
+        for name, count in counts.items():
+            stats_key = f"translation:stats:{name}"
+            cache.add(stats_key, 0, timeout=None)
+            cache.incr(stats_key, count)
+    except Exception:
+        pass
+
+
+def _record_stats(counts: Counter) -> None:
+    # Counted in memory; the shared counters are updated at most every TRANSLATION_STATS_FLUSH_INTERVAL
+    # seconds so lookups on the render path do not pay for extra cache round trips
+    with _stats_lock:
+        _process_stats.update(counts)
+        _unflushed_stats.update(counts)
+        due = time.monotonic() - _stats_flushed_at >= getattr(settings, "TRANSLATION_STATS_FLUSH_INTERVAL", 60)
+    if due:
+        _flush_stats()
+
+
+def translation_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters for this process and across all processes."""
+    _flush_stats()
+    try:
+        shared = cache.get_many([f"translation:stats:{name}" for name in STATS_COUNTERS])
+    except Exception:
+        shared = {}
+    return {
+        "process": {name: _process_stats.get(name, 0) for name in STATS_COUNTERS},
+        "shared": {name: int(shared.get(f"translation:stats:{name}", 0)) for name in STATS_COUNTERS},
+    }
 
 
-@lru_cache(maxsize=256)
-def _translate_tuple(values_tuple: Tuple[str, ...], target_language: LanguageCode) -> Tuple[str, ...]:
-    translated = _translate_list(list(values_tuple), target_language)
-    return tuple(translated)
+# Google Translate v2 accepts at most 128 q values per request
+MAX_BATCH_SIZE = 128
+_BATCH_WAIT_TIMEOUT = 10
 
 
-def translate_strings(strings: Mapping[str, str], target_language: Union[LanguageCode, None]) -> Translations:
+class _TranslationBatcher:
+    """
+    Single-flight, batched cache misses for all threads of the process.
+
+    A key already being translated is never requested again; callers share its
+    future. The first caller to queue work for a language and format waits a
+    short window, then sends everything queued by then in batches of up to
+    MAX_BATCH_SIZE and stores the results in both cache tiers.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._pending: Dict[tuple, List[tuple]] = {}
+
+    def submit(self, items: Sequence[tuple], target_language: LanguageCode, text_format: str) -> Dict[str, Future]:
+        group = (target_language, text_format)
+        futures = {}
+        lead = False
+        with self._lock:
+            for key, text in items:
+                future = self._inflight.get(key)
+                if future is None:
+                    future = Future()
+                    self._inflight[key] = future
+                    queue = self._pending.setdefault(group, [])
+                    lead = lead or not queue
+                    queue.append((key, text))
+                futures[key] = future
+        if lead:
+            self._flush(group)
+        return futures
+
+    def _flush(self, group: tuple) -> None:
+        time.sleep(getattr(settings, "TRANSLATION_BATCH_WINDOW", 0.02))
+        with self._lock:
+            queue = self._pending.pop(group, [])
+        target_language, text_format = group
+        for start in range(0, len(queue), MAX_BATCH_SIZE):
+            batch = queue[start:start + MAX_BATCH_SIZE]
+            translated = None
+            try:
+                translated = _translate_list([text for _, text in batch], target_language, text_format)
+                if translated is None:
+                    _record_stats(Counter(api_failures=1))
+                    try:
+                        cache.set_many(
+                            {_failure_key(key): 1 for key, _ in batch},
+                            timeout=getattr(settings, "TRANSLATION_FAILURE_TTL", 60),
+                        )
+                    except Exception:
+                        pass
+                else:
+                    fresh = {key: value for (key, _), value in zip(batch, translated)}
+                    for key, value in fresh.items():
+                        _local_set(key, value)
+                    try:
+                        cache.set_many(fresh, timeout=None)
+                    except Exception:
+                        pass
+            finally:
+                with self._lock:
+                    for index, (key, _) in enumerate(batch):
+                        future = self._inflight.pop(key)
+                        future.set_result(translated[index] if translated is not None else None)
+
+
+_batcher = _TranslationBatcher()
+
+
+# Misses from non-blocking lookups are translated here, off the request path
+_background = ThreadPoolExecutor(max_workers=2, thread_name_prefix="translation")
+# Keys queued or running in the background; a key is never queued twice, and past
+# TRANSLATION_BACKGROUND_QUEUE_SIZE keys new misses are dropped until the queue drains
+_background_keys: set = set()
+_background_lock = threading.Lock()
+
+
+def _queue_background(items: Sequence[tuple], target_language: LanguageCode, text_format: str) -> None:
+    limit = getattr(settings, "TRANSLATION_BACKGROUND_QUEUE_SIZE", 1000)
+    with _background_lock:
+        items = [(key, text) for key, text in items if key not in _background_keys]
+        items = items[:max(0, limit - len(_background_keys))]
+        _background_keys.update(key for key, _ in items)
+    if items:
+        _background.submit(_fill_background, items, target_language, text_format)
+
+
+def _fill_background(items: Sequence[tuple], target_language: LanguageCode, text_format: str) -> None:
+    try:
+        futures = _batcher.submit(items, target_language, text_format)
+    except Exception:
+        futures = {}
+    for key, _ in items:
+        future = futures.get(key)
+        if future is None:
+            with _background_lock:
+                _background_keys.discard(key)
+        else:
+            # A key joined to another caller's batch stays queued until that batch is done
+            future.add_done_callback(lambda _, key=key: _release_background_key(key))
+
+
+def _release_background_key(key: str) -> None:
+    with _background_lock:
+        _background_keys.discard(key)
+_fallback_state = threading.local()
+
+
+@contextmanager
+def track_fallbacks():
+    """
+    Collect the strings served untranslated inside the block, by non-blocking lookups or failed
+    translation calls. An empty list afterwards means every string was translated, so the output
+    is safe to cache.
+    """
+    previous = getattr(_fallback_state, "fallbacks", None)
+    fallbacks: List[str] = []
+    _fallback_state.fallbacks = fallbacks
+    try:
+        yield fallbacks
+    finally:
+        _fallback_state.fallbacks = previous
+
+
+def _translate_cached(
+    values: Sequence[str], target_language: LanguageCode, text_format: str = "text", wait: bool = True
+) -> List[str]:
+    keys = [_cache_key(value, target_language, text_format) for value in values]
+    texts = dict(zip(keys, values))
+    results: Dict[str, str] = {}
+    counts: Counter = Counter()
+
+    missing = []
+    for key, text in texts.items():
+        if not text.strip():
+            results[key] = text
+            continue
+        cached = _local_get(key)
+        if cached is not None:
+            results[key] = cached
+            counts["local_hits"] += 1
+        else:
+            missing.append(key)
+
+    fallbacks = getattr(_fallback_state, "fallbacks", None)
+    if missing:
+        # The failure markers come back in the same round trip as the translations
+        try:
+            shared = cache.get_many(missing + [_failure_key(key) for key in missing])
+        except Exception:
+            shared = {}
+        hits = [key for key in missing if key in shared]
+        for key in hits:
+            results[key] = shared[key]
+            _local_set(key, shared[key])
+        counts["shared_hits"] += len(hits)
+        # Recently failed keys are served as the source text without calling the API again
+        failed = [key for key in missing if key not in shared and _failure_key(key) in shared]
+        for key in failed:
+            results[key] = texts[key]
+        if fallbacks is not None:
+            fallbacks.extend(texts[key] for key in failed)
+        missing = [key for key in missing if key not in results]
+
+    if missing and not wait:
+        # Serve the source text now and fill the cache in the background for later requests
+        counts["misses"] += len(missing)
+        for key in missing:
+            results[key] = texts[key]
+        if fallbacks is not None:
+            fallbacks.extend(texts[key] for key in missing)
+        _queue_background([(key, texts[key]) for key in missing], target_language, text_format)
+    elif missing:
+        counts["misses"] += len(missing)
+        futures = _batcher.submit([(key, texts[key]) for key in missing], target_language, text_format)
+        for key, future in futures.items():
+            try:
+                value = future.result(timeout=_BATCH_WAIT_TIMEOUT)
+            except Exception:
+                value = None
+            # Failed lookups fall back to the source text without being cached
+            results[key] = texts[key] if value is None else value
+            if value is None and fallbacks is not None:
+                fallbacks.append(texts[key])
+
+    _record_stats(counts)
+    return [results[key] for key in keys]
+
+
+def translate_strings(
+    strings: Mapping[str, str], target_language: Union[LanguageCode, None], wait: bool = True
+) -> Translations:
+    """Translate mapping values; with wait=False misses return the source text and are filled in the background."""
     if not target_language:
         return dict(strings)
-    keys = tuple(strings.keys())
-    values_tuple = tuple(strings[key] for key in keys)
-    translated_tuple = _translate_tuple(values_tuple, target_language)
-    return {key: value for key, value in zip(keys, translated_tuple)}
+    keys = list(strings.keys())
+    translated = _translate_cached([strings[key] for key in keys], target_language, wait=wait)
+    return {key: value for key, value in zip(keys, translated)}
 
 
-def translate_sequence(sequence: Iterable[str], target_language: Union[LanguageCode, None]) -> List[str]:
+def translate_sequence(
+    sequence: Iterable[str], target_language: Union[LanguageCode, None], wait: bool = True
+) -> List[str]:
+    """Translate a sequence of strings; wait behaves as in translate_strings."""
     values = list(sequence)
     if not target_language:
         return values
-    translated_tuple = _translate_tuple(tuple(values), target_language)
-    return list(translated_tuple)
+    return _translate_cached(values, target_language, wait=wait)
+
+
+_PROTECTED_RE = re.compile(r'<span translate="no">(.*?)</span>', re.S)
+_LINE_BREAK_RE = re.compile(r"\s*<br\s*/?>\s?", re.I)
+
+
+def _protect(value: str, placeholders: Sequence[str]) -> str:
+    protected = html.escape(value, quote=False)
+    for placeholder in placeholders:
+        escaped = html.escape(placeholder, quote=False)
+        protected = protected.replace(escaped, f'<span translate="no">{escaped}</span>')
+    return protected.replace("\n", "<br>")
+
+
+def translate_template(
+    sequence: Iterable[str], target_language: Union[LanguageCode, None], placeholders: Sequence[str]
+) -> List[str]:
+    """
+    Translate template strings, leaving every placeholder exactly as written.
+    Strings that could not be translated come back unchanged and are reported to track_fallbacks().
+    """
+    values = list(sequence)
+    if not target_language or not values:
+        return values
+    protected = [_protect(value, placeholders) for value in values]
+    result = []
+    for original, sent, translated in zip(values, protected, _translate_cached(protected, target_language, "html")):
+        if translated == sent:
+            # Untranslated fallback (no API key or a failed call)
+            result.append(original)
+            continue
+        translated = _LINE_BREAK_RE.sub("\n", translated)
+        result.append(_PROTECTED_RE.sub(lambda match: match.group(1), translated))
+    return result
 
 
 def should_localize(country: Union[str, None]) -> bool: